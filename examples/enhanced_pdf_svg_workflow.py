@@ -19,6 +19,7 @@ import json
 import tempfile
 import hashlib
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Union, Any
 from enum import Enum
@@ -127,29 +128,42 @@ class PDFProcessor:
         return metadata
     
     def extract_text(self, pages: Optional[List[int]] = None, dpi: int = 300) -> Dict[int, str]:
-        """Extract text from PDF pages using Tesseract OCR."""
+        """Extract text from PDF pages using Tesseract OCR.
+        
+        Pages are rasterized and OCR'd in parallel worker threads; the heavy
+        lifting happens in the pdftoppm/tesseract child processes, so the GIL
+        is not a bottleneck.
+        """
         if not pages:
             # Default to all pages if none specified
             pages = list(range(1, self._get_page_count() + 1))
         
         extracted_text = {}
+        if not pages:
+            return extracted_text
         
-        for page_num in pages:
-            try:
-                # Convert PDF page to image
-                img_path = os.path.join(self.temp_dir, f"page_{page_num:03d}.png")
-                self._convert_pdf_page_to_image(page_num, img_path, dpi)
-                
-                # Extract text using Tesseract
-                text = self._extract_text_with_tesseract(img_path)
-                if text.strip():
+        with ThreadPoolExecutor(max_workers=min(4, len(pages))) as executor:
+            results = executor.map(lambda page_num: self._ocr_one_page(page_num, dpi), pages)
+            for page_num, text in zip(pages, results):
+                if text and text.strip():
                     extracted_text[page_num] = text
-                    
-            except Exception as e:
-                print(f"Error processing page {page_num}: {e}", file=sys.stderr)
         
         return extracted_text
     
+    def _ocr_one_page(self, page_num: int, dpi: int = 300) -> Optional[str]:
+        """Rasterize a single page and run Tesseract on it."""
+        try:
+            # Convert PDF page to image
+            img_path = os.path.join(self.temp_dir, f"page_{page_num:03d}.png")
+            self._convert_pdf_page_to_image(page_num, img_path, dpi)
+            
+            # Extract text using Tesseract
+            return self._extract_text_with_tesseract(img_path)
+            
+        except Exception as e:
+            print(f"Error processing page {page_num}: {e}", file=sys.stderr)
+            return None
+    
     def generate_svg(self, output_path: str, pages: Optional[List[int]] = None, 
                     include_text: bool = True, dpi: int = 300) -> str:
         """Generate an SVG with embedded PDF and extracted content."""
@@ -320,11 +334,14 @@ class PDFProcessor:
     def _extract_text_with_tesseract(self, image_path: str) -> str:
         """Extract text from an image using Tesseract OCR."""
         try:
+            # Pages are OCR'd concurrently, so keep each tesseract process
+            # single-threaded to avoid oversubscribing the CPU with OpenMP workers
             result = subprocess.run(
                 ['tesseract', image_path, 'stdout', '-l', 'eng'],
                 capture_output=True,
                 text=True,
-                check=True
+                check=True,
+                env={**os.environ, 'OMP_THREAD_LIMIT': '1'}
             )
             return result.stdout.strip()
         except (subprocess.CalledProcessError, FileNotFoundError) as e:
@@ -662,6 +679,23 @@ class PDFProcessor:
         except Exception:
             pass
 
+def parse_page_range(spec: str) -> Optional[List[int]]:
+    """Parse a page range string like "1,3,5-7" into a list of page numbers.
+    
+    Returns None for "all" or an empty string, meaning every page.
+    """
+    if not spec or spec.lower() == 'all':
+        return None
+    
+    pages = []
+    for part in spec.split(','):
+        if '-' in part:
+            start, end = map(int, part.split('-'))
+            pages.extend(range(start, end + 1))
+        else:
+            pages.append(int(part))
+    return pages
+
 def main():
     """Main function for command-line usage."""
     parser = argparse.ArgumentParser(
@@ -690,15 +724,7 @@ def main():
     
     try:
         # Parse page range
-        pages = None
-        if args.pages and args.pages.lower() != 'all':
-            pages = []
-            for part in args.pages.split(','):
-                if '-' in part:
-                    start, end = map(int, part.split('-'))
-                    pages.extend(range(start, end + 1))
-                else:
-                    pages.append(int(part))
+        pages = parse_page_range(args.pages)
         
         # Process the PDF
         processor = PDFProcessor(args.input_pdf, args.password)
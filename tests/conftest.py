@@ -0,0 +1,122 @@
+"""
+Shared fixtures for the XQR test suite
+"""
+
+import io
+from pathlib import Path
+
+import pytest
+
+
+SVG_CONTENT = '''<?xml version="1.0" encoding="UTF-8"?>
+<svg xmlns="http://www.w3.org/2000/svg" width="200" height="200">
+    <metadata>
+        <title>Test SVG</title>
+        <description>Test file</description>
+    </metadata>
+    <rect
+        x="10"
+        y="10"
+        width="50"
+        height="50"
+        fill="red"
+        id="test-rect"
+    />
+    <text
+        x="50"
+        y="150"
+        id="test-text"
+        font-size="16"
+    >Hello World</text>
+</svg>'''
+
+XML_CONTENT = '''<?xml version="1.0" encoding="UTF-8"?>
+<data>
+    <metadata>
+        <title>Test Data</title>
+        <version>1.0</version>
+    </metadata>
+    <records>
+        <record id="1">
+            <name>John Doe</name>
+            <age>30</age>
+        </record>
+        <record id="2">
+            <name>Jane Smith</name>
+            <age>25</age>
+        </record>
+    </records>
+</data>'''
+
+HTML_CONTENT = '''<!DOCTYPE html>
+<html>
+<head>
+    <title>Test HTML</title>
+    <meta name="description" content="Test file">
+</head>
+<body>
+    <h1 id="main-title">Welcome</h1>
+    <p class="intro">This is a test.</p>
+    <ul>
+        <li class="item">Item 1</li>
+        <li class="item">Item 2</li>
+    </ul>
+</body>
+</html>'''
+
+
+def _write_sample(tmp_path_factory: pytest.TempPathFactory, name: str, content: str) -> str:
+    """Write a sample document once and return its path"""
+    path = tmp_path_factory.mktemp('samples') / name
+    path.write_text(content, encoding='utf-8')
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def sample_svg(tmp_path_factory: pytest.TempPathFactory) -> str:
+    """Create an SVG file for tests that need a real path
+
+    The file is written once per module; tests must not modify it.
+
+    Returns:
+        str: Path to the SVG file
+    """
+    return _write_sample(tmp_path_factory, 'sample.svg', SVG_CONTENT)
+
+
+@pytest.fixture(scope="module")
+def sample_xml(tmp_path_factory: pytest.TempPathFactory) -> str:
+    """Create an XML file for tests that need a real path
+
+    Returns:
+        str: Path to the XML file
+    """
+    return _write_sample(tmp_path_factory, 'sample.xml', XML_CONTENT)
+
+
+@pytest.fixture(scope="module")
+def sample_html(tmp_path_factory: pytest.TempPathFactory) -> str:
+    """Create an HTML file for tests that need a real path
+
+    Returns:
+        str: Path to the HTML file
+    """
+    return _write_sample(tmp_path_factory, 'sample.html', HTML_CONTENT)
+
+
+@pytest.fixture
+def svg_source() -> io.BytesIO:
+    """In-memory SVG document, parsed without touching the disk"""
+    return io.BytesIO(SVG_CONTENT.encode('utf-8'))
+
+
+@pytest.fixture
+def xml_source() -> io.BytesIO:
+    """In-memory XML document, parsed without touching the disk"""
+    return io.BytesIO(XML_CONTENT.encode('utf-8'))
+
+
+@pytest.fixture
+def html_source() -> io.BytesIO:
+    """In-memory HTML document, parsed without touching the disk"""
+    return io.BytesIO(HTML_CONTENT.encode('utf-8'))
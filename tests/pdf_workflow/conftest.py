@@ -7,6 +7,10 @@ import os
 import shutil
 from pathlib import Path
 
+# Keep each tesseract child single-threaded; pages are already OCR'd in
+# parallel, and OpenMP thread start-up dominates on short jobs.
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
 # Skip tests if required system dependencies are not available
 REQUIRED_BINARIES = ['pdftoppm', 'tesseract']
 
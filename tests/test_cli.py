@@ -1,10 +1,13 @@
 """Tests for the XQR CLI functionality."""
 import os
 import sys
+import tempfile
 from pathlib import Path
 from unittest import TestCase, mock
 from io import StringIO
 
+from lxml import etree
+
 # Add the parent directory to the path so we can import the module
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -15,14 +18,7 @@ from xqr.core import FileEditor
 class TestCLI(TestCase):
     """Test cases for the CLI functionality."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.cli = CLI()
-        self.test_file = Path(__file__).parent / "test_data" / "example.svg"
-        self.test_file.parent.mkdir(exist_ok=True)
-        
-        # Create a test SVG file
-        svg_content = """<?xml version="1.0" encoding="UTF-8"?>
+    SVG_CONTENT = """<?xml version="1.0" encoding="UTF-8"?>
         <svg xmlns="http://www.w3.org/2000/svg" width="200" height="200">
             <text id="text1">Hello SVG</text>
             <text id="text2">New Text</text>
@@ -30,13 +26,61 @@ class TestCLI(TestCase):
                 <rect id="rect1" width="50" height="50"/>
             </g>
         </svg>"""
-        with open(self.test_file, 'w', encoding='utf-8') as f:
-            f.write(svg_content)
 
-    def tearDown(self):
-        """Clean up test files."""
-        if self.test_file.exists():
-            self.test_file.unlink()
+    # Lightweight parser for re-reading files written by the code under test
+    XML_PARSER = etree.XMLParser(huge_tree=False, remove_blank_text=True)
+    ITEM_XPATH = etree.XPath("//item")
+
+    # Editor shared by the read-only tests, see _editor()
+    _shared_editor = None
+
+    @classmethod
+    def setUpClass(cls):
+        """Create the shared test SVG file once for the whole class."""
+        cls.test_file = Path(__file__).parent / "test_data" / "example.svg"
+        cls.test_file.parent.mkdir(exist_ok=True)
+        cls.test_file.write_text(cls.SVG_CONTENT, encoding='utf-8')
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the shared test file."""
+        cls._shared_editor = None
+        if cls.test_file.exists():
+            cls.test_file.unlink()
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.cli = CLI()
+
+    def _make_test_file(self, content):
+        """Write content to a fresh per-test file so the shared file stays intact."""
+        fd, path = tempfile.mkstemp(suffix='.svg')
+        os.close(fd)
+        path = Path(path)
+        self.addCleanup(path.unlink)
+        path.write_text(content, encoding='utf-8')
+        return path
+
+    def _editor(self, force=False):
+        """Return a FileEditor for the test file, reusing the class-wide one.
+
+        Read-only tests share a single parsed editor; pass ``force=True`` when
+        the file was just written or the editor is going to be modified.
+        """
+        if force:
+            return FileEditor(self.test_file)
+        cls = type(self)
+        if cls._shared_editor is None:
+            cls._shared_editor = FileEditor(cls.test_file, readonly=True)
+        return cls._shared_editor
+
+    def _find_text(self, xpath):
+        """Parse the test file from disk and return the text at xpath."""
+        return etree.parse(str(self.test_file), self.XML_PARSER).findtext(xpath)
+
+    def _parse_items(self):
+        """Parse the test file from disk and return its <item> elements."""
+        return self.ITEM_XPATH(etree.parse(str(self.test_file), self.XML_PARSER))
 
     def test_parse_file_xpath(self):
         """Test parsing file and XPath from argument."""
@@ -52,8 +96,7 @@ class TestCLI(TestCase):
     def test_selective_update_single_element(self):
         """Test that updates only affect the first matching element by default."""
         # Create a test file with multiple matching elements
-        with open(self.test_file, 'w', encoding='utf-8') as f:
-            f.write("""<?xml version="1.0" encoding="UTF-8"?>
+        self.test_file = self._make_test_file("""<?xml version="1.0" encoding="UTF-8"?>
             <root>
                 <item>Original 1</item>
                 <item>Original 2</item>
@@ -67,8 +110,7 @@ class TestCLI(TestCase):
             self.assertTrue(result)
             
         # Verify file content - only first element should be updated
-        editor = FileEditor(self.test_file)
-        elements = editor.find_by_xpath("//item")
+        elements = self._parse_items()
         self.assertEqual(len(elements), 3, "Should find 3 item elements")
         self.assertEqual(elements[0].text, "Updated Value", "First element should be updated")
         self.assertEqual(elements[1].text, "Original 2", "Second element should remain unchanged")
@@ -77,8 +119,7 @@ class TestCLI(TestCase):
     def test_selective_update_all_elements(self):
         """Test that --all flag updates all matching elements."""
         # Create a test file with multiple matching elements
-        with open(self.test_file, 'w', encoding='utf-8') as f:
-            f.write("""<?xml version="1.0" encoding="UTF-8"?>
+        self.test_file = self._make_test_file("""<?xml version="1.0" encoding="UTF-8"?>
             <root>
                 <item>Original 1</item>
                 <item>Original 2</item>
@@ -112,8 +153,7 @@ class TestCLI(TestCase):
                 self.assertTrue(result, f"handle_direct_operation should return True but returned {result}")
                 
                 # Verify the file was actually updated
-                editor = FileEditor(self.test_file)
-                elements = editor.find_by_xpath("//item")
+                elements = self._parse_items()
                 self.assertEqual(len(elements), 3, "Should find 3 item elements")
                 self.assertEqual(elements[0].text, "Updated Value", "First element should be updated")
                 self.assertEqual(elements[1].text, "Updated Value", "Second element should be updated")
@@ -122,20 +162,11 @@ class TestCLI(TestCase):
         finally:
             # Restore stderr
             sys.stderr = old_stderr
-            
-        # Verify file content - all elements should be updated
-        editor = FileEditor(self.test_file)
-        elements = editor.find_by_xpath("//item")
-        self.assertEqual(len(elements), 3, "Should find 3 item elements")
-        self.assertEqual(elements[0].text, "Updated Value", "First element should be updated")
-        self.assertEqual(elements[1].text, "Updated Value", "Second element should be updated")
-        self.assertEqual(elements[2].text, "Updated Value", "Third element should be updated")
         
     def test_selective_update_attribute(self):
         """Test selective update with attributes."""
         # Create a test file with multiple matching elements
-        with open(self.test_file, 'w', encoding='utf-8') as f:
-            f.write("""<?xml version="1.0" encoding="UTF-8"?>
+        self.test_file = self._make_test_file("""<?xml version="1.0" encoding="UTF-8"?>
             <root>
                 <item id="1" class="test">Item 1</item>
                 <item id="2" class="test">Item 2</item>
@@ -149,8 +180,7 @@ class TestCLI(TestCase):
             self.assertTrue(result)
             
         # Verify file content - only first element's class should be updated
-        editor = FileEditor(self.test_file)
-        elements = editor.find_by_xpath("//item")
+        elements = self._parse_items()
         self.assertEqual(len(elements), 3, "Should find 3 item elements")
         self.assertEqual(elements[0].get("class"), "updated", "First element's class should be updated")
         self.assertEqual(elements[1].get("class"), "test", "Second element's class should remain unchanged")
@@ -171,31 +201,59 @@ class TestCLI(TestCase):
         handle_direct_operation(args)
         self.assertIn("No elements found", mock_stdout.getvalue())
 
+    @mock.patch('sys.stdout', new_callable=StringIO)
+    def test_handle_direct_operation_limit(self, mock_stdout):
+        """Test limiting the number of matches printed."""
+        handle_direct_operation([f"{self.test_file}//text", "--limit", "1"])
+        output = mock_stdout.getvalue()
+        self.assertIn("1. <text", output)
+        self.assertNotIn("2. ", output)
+
     @mock.patch('sys.stdout', new_callable=StringIO)
     def test_handle_direct_operation_write(self, mock_stdout):
         """Test direct operation with write (value provided)."""
+        self.test_file = self._make_test_file(self.SVG_CONTENT)
+
         # Test update operation
         args = [f"{self.test_file}//text[@id='text1']", "Updated Text"]
         handle_direct_operation(args)
         self.assertIn("✅ Updated", mock_stdout.getvalue())
         
         # Verify the update
-        editor = FileEditor(self.test_file)
-        result = editor.get_element_text("//text[@id='text1']")
-        self.assertEqual(result, "Updated Text")
+        self.assertEqual(self._find_text(".//{*}text[@id='text1']"), "Updated Text")
 
     @mock.patch('sys.stdout', new_callable=StringIO)
     def test_handle_direct_operation_delete(self, mock_stdout):
         """Test direct operation with delete (empty string as value)."""
+        self.test_file = self._make_test_file(self.SVG_CONTENT)
+
         # Test delete operation
         args = [f"{self.test_file}//text[@id='text1']", ""]
         handle_direct_operation(args)
         self.assertIn("✅ Deleted content", mock_stdout.getvalue())
         
         # Verify the delete
-        editor = FileEditor(self.test_file)
-        result = editor.get_element_text("//text[@id='text1']")
-        self.assertEqual(result, "")
+        self.assertEqual(self._find_text(".//{*}text[@id='text1']"), "")
+
+    @mock.patch('sys.stdout', new_callable=StringIO)
+    def test_handle_direct_operation_prune(self, mock_stdout):
+        """Test direct operation delete that removes the elements."""
+        self.test_file = self._make_test_file(self.SVG_CONTENT)
+
+        args = [f"{self.test_file}//text[@id='text1']", "", "--prune"]
+        handle_direct_operation(args)
+        self.assertIn("✅ Removed 1 element", mock_stdout.getvalue())
+        self.assertIsNone(self._find_text(".//{*}text[@id='text1']"))
+
+        # Nested matches are removed along with their ancestor
+        self.test_file = self._make_test_file(
+            '<root><g id="a"><g id="b"><g id="c"/></g></g><g id="d"/></root>'
+        )
+        mock_stdout.truncate(0)
+        mock_stdout.seek(0)
+        handle_direct_operation([f"{self.test_file}//g", "", "--prune"])
+        self.assertIn("✅ Removed 2 element", mock_stdout.getvalue())
+        self.assertEqual(len(etree.parse(str(self.test_file)).getroot()), 0)
 
     @mock.patch('sys.stdout', new_callable=StringIO)
     def test_handle_direct_operation_get_command(self, mock_stdout):
@@ -223,11 +281,27 @@ class TestCLI(TestCase):
                 self.assertIn(f"✅ Loaded {self.test_file}", mock_stdout.getvalue())
                 self.assertIsNotNone(self.cli.editor)
 
+    def test_command_info_matches_classes(self):
+        """Test that the command metadata agrees with the command classes."""
+        from xqr.commands import COMMAND_INFO, get_command_class
+
+        for name, info in COMMAND_INFO.items():
+            cmd_class = get_command_class(name)
+            self.assertEqual(info.help, cmd_class.help, name)
+            self.assertEqual(info.requires_editor, cmd_class.requires_editor, name)
+
+    def test_cli_query_many(self):
+        """Test running several queries in one batch."""
+        self.cli.editor = self._editor()
+        texts, rects = self.cli.query_many(["//text", "//rect"])
+        self.assertEqual([el.get("id") for el in texts], ["text1", "text2"])
+        self.assertEqual([el.get("id") for el in rects], ["rect1"])
+
     @mock.patch('sys.stdout', new_callable=StringIO)
     def test_cli_get_command(self, mock_stdout):
         """Test the get command."""
         # First load the file
-        self.cli.editor = FileEditor(self.test_file)
+        self.cli.editor = self._editor()
         
         # Test get command
         with mock.patch('sys.argv', ['xqr', 'get', "//text[@id='text1']"]):
@@ -246,7 +320,7 @@ class TestCLI(TestCase):
     def test_cli_query_command(self, mock_stdout):
         """Test the query command."""
         # First load the file
-        self.cli.editor = FileEditor(self.test_file)
+        self.cli.editor = self._editor()
         
         # Test query command with text type (default)
         with mock.patch('sys.argv', ['xqr', 'query', "//text[@id='text1']"]):
@@ -263,8 +337,9 @@ class TestCLI(TestCase):
     @mock.patch('sys.stdout', new_callable=StringIO)
     def test_cli_set_command(self, mock_stdout):
         """Test the set command."""
-        # First load the file
-        self.cli.editor = FileEditor(self.test_file)
+        # First load a private copy of the file, since the command modifies it
+        self.test_file = self._make_test_file(self.SVG_CONTENT)
+        self.cli.editor = self._editor(force=True)
         
         # Test set command
         with mock.patch('sys.argv', ['xqr', 'set', "//text[@id='text1']", "New Value"]):
@@ -279,7 +354,7 @@ class TestCLI(TestCase):
     def test_cli_ls_command(self, mock_stdout):
         """Test the ls command."""
         # First load the file
-        self.cli.editor = FileEditor(self.test_file)
+        self.cli.editor = self._editor()
         
         # Test ls command with XPath
         with mock.patch('sys.argv', ['xqr', 'ls', "//text"]):
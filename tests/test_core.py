@@ -2,132 +2,15 @@
 Tests for the core FileEditor functionality
 """
 
+import hashlib
+import io
 import pytest
 import tempfile
 import os
 from pathlib import Path
-from typing import Generator
 
 from xqr.core import FileEditor
-
-
-@pytest.fixture
-def sample_svg() -> Generator[str, None, None]:
-    """Create a temporary SVG file for testing
-
-    Returns:
-        str: Path to the temporary SVG file
-    """
-    svg_content = '''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" width="200" height="200">
-    <metadata>
-        <title>Test SVG</title>
-        <description>Test file</description>
-    </metadata>
-    <rect
-        x="10"
-        y="10"
-        width="50"
-        height="50"
-        fill="red"
-        id="test-rect"
-    />
-    <text
-        x="50"
-        y="150"
-        id="test-text"
-        font-size="16"
-    >Hello World</text>
-</svg>'''
-
-    with tempfile.NamedTemporaryFile(
-        mode='w',
-        suffix='.svg',
-        delete=False,
-        encoding='utf-8'
-    ) as f:
-        f.write(svg_content)
-        f.flush()
-        yield f.name
-
-    # Cleanup
-    os.unlink(f.name)
-
-
-@pytest.fixture
-def sample_xml() -> Generator[str, None, None]:
-    """Create a temporary XML file for testing
-
-    Returns:
-        str: Path to the temporary XML file
-    """
-    xml_content = '''<?xml version="1.0" encoding="UTF-8"?>
-<data>
-    <metadata>
-        <title>Test Data</title>
-        <version>1.0</version>
-    </metadata>
-    <records>
-        <record id="1">
-            <name>John Doe</name>
-            <age>30</age>
-        </record>
-        <record id="2">
-            <name>Jane Smith</name>
-            <age>25</age>
-        </record>
-    </records>
-</data>'''
-
-    with tempfile.NamedTemporaryFile(
-        mode='w',
-        suffix='.xml',
-        delete=False,
-        encoding='utf-8'
-    ) as f:
-        f.write(xml_content)
-        f.flush()
-        yield f.name
-
-    # Cleanup
-    os.unlink(f.name)
-
-
-@pytest.fixture
-def sample_html() -> Generator[str, None, None]:
-    """Create a temporary HTML file for testing
-
-    Returns:
-        str: Path to the temporary HTML file
-    """
-    html_content = '''<!DOCTYPE html>
-<html>
-<head>
-    <title>Test HTML</title>
-    <meta name="description" content="Test file">
-</head>
-<body>
-    <h1 id="main-title">Welcome</h1>
-    <p class="intro">This is a test.</p>
-    <ul>
-        <li class="item">Item 1</li>
-        <li class="item">Item 2</li>
-    </ul>
-</body>
-</html>'''
-
-    with tempfile.NamedTemporaryFile(
-        mode='w',
-        suffix='.html',
-        delete=False,
-        encoding='utf-8'
-    ) as f:
-        f.write(html_content)
-        f.flush()
-        yield f.name
-
-    # Cleanup
-    os.unlink(f.name)
+from xqr.core.editor import _TREE_CACHE
 
 
 class TestFileEditor:
@@ -170,6 +53,91 @@ class TestFileEditor:
         assert editor.file_type == 'html'
         assert editor.tree is not None
 
+    def test_load_in_memory(self, svg_source: io.BytesIO) -> None:
+        """Test loading a document from an in-memory source
+
+        Args:
+            svg_source: In-memory SVG document (fixture)
+        """
+        editor = FileEditor(svg_source)
+        assert editor.file_path is None
+        assert editor.file_type == 'svg'
+        assert editor.get_element_text("//text[@id='test-text']") == "Hello World"
+
+        # Without a file path there is nowhere to save to by default
+        with pytest.raises(IOError):
+            editor.save()
+
+    def test_tree_cache(self, sample_svg: str, tmp_path: Path) -> None:
+        """Test that parsed trees are shared only between read-only editors"""
+        first = FileEditor(sample_svg, readonly=True)
+        second = FileEditor(sample_svg, readonly=True)
+        assert first.tree is second.tree
+
+        # Writable editors parse their own tree
+        editor = FileEditor(sample_svg)
+        assert editor.tree is not first.tree
+        editor.set_element_text("//text[@id='test-text']", "Changed")
+        assert first.get_element_text("//text[@id='test-text']") == "Hello World"
+
+        # Read-only editors cannot change the shared tree
+        with pytest.raises(PermissionError):
+            first.set_element_text("//text[@id='test-text']", "Changed")
+        with pytest.raises(PermissionError):
+            first.remove_element("//text[@id='test-text']")
+        with pytest.raises(PermissionError):
+            first.save(tmp_path / "readonly.svg")
+        assert second.get_element_text("//text[@id='test-text']") == "Hello World"
+
+        # Saved changes are picked up by new editors
+        path = tmp_path / "cached.svg"
+        path.write_text(Path(sample_svg).read_text())
+        editor = FileEditor(path)
+        # Only read-only loads are cached
+        assert not any(key[0] == os.path.abspath(path) for key in _TREE_CACHE)
+        editor.set_element_text("//text[@id='test-text']", "Saved")
+        editor.save()
+        assert FileEditor(path, readonly=True).get_element_text("//text[@id='test-text']") == "Saved"
+
+    def test_original_content(self, sample_svg: str, tmp_path: Path) -> None:
+        """Test that original_content is the text as loaded, read only when asked for"""
+        path = tmp_path / "original.svg"
+        source = Path(sample_svg).read_text()
+        path.write_text(source)
+        editor = FileEditor(path)
+        editor.set_element_text("//text[@id='test-text']", "Saved")
+        assert editor.original_content == source
+        assert editor.original_digest == hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+        # Saving does not read the file first, so the loaded text is gone
+        # once it has been overwritten
+        editor = FileEditor(path)
+        editor.set_element_text("//text[@id='test-text']", "Saved")
+        editor.save()
+        assert editor._content is None and editor._digest is None
+        with pytest.raises(IOError):
+            editor.original_content
+
+        # The same goes for changes behind the editor's back
+        editor = FileEditor(path)
+        path.write_text(source + "\n<!-- edited -->\n")
+        with pytest.raises(IOError):
+            editor.original_digest
+
+    def test_from_subtree(self, sample_xml: str) -> None:
+        """Test loading only a subtree of a file"""
+        editor = FileEditor.from_subtree(sample_xml, "record")
+        assert editor.tree.tag == "record"
+        assert editor.tree.get("id") == "1"
+        assert editor.get_element_text("//name") == "John Doe"
+
+        # The subtree must not replace the whole file
+        with pytest.raises(IOError):
+            editor.save()
+
+        with pytest.raises(ValueError):
+            FileEditor.from_subtree(sample_xml, "missing")
+
     def test_file_not_found(self) -> None:
         """Test handling of non-existent file"""
         with pytest.raises(FileNotFoundError):
@@ -179,13 +147,13 @@ class TestFileEditor:
         not hasattr(FileEditor, 'find_by_xpath'),
         reason="XPath support requires lxml"
     )
-    def test_xpath_query_text(self, sample_svg: str) -> None:
+    def test_xpath_query_text(self, svg_source: io.BytesIO) -> None:
         """Test XPath text query
 
         Args:
-            sample_svg: Path to a sample SVG file (fixture)
+            svg_source: In-memory SVG document (fixture)
         """
-        editor = FileEditor(sample_svg)
+        editor = FileEditor(svg_source)
         text = editor.get_element_text("//text[@id='test-text']")
         assert text == "Hello World"
 
@@ -193,13 +161,13 @@ class TestFileEditor:
         not hasattr(FileEditor, 'find_by_xpath'),
         reason="XPath support requires lxml"
     )
-    def test_xpath_query_attribute(self, sample_svg: str) -> None:
+    def test_xpath_query_attribute(self, svg_source: io.BytesIO) -> None:
         """Test XPath attribute query
 
         Args:
-            sample_svg: Path to a sample SVG file (fixture)
+            svg_source: In-memory SVG document (fixture)
         """
-        editor = FileEditor(sample_svg)
+        editor = FileEditor(svg_source)
         fill = editor.get_element_attribute("//rect[@id='test-rect']", "fill")
         assert fill == "red"
 
@@ -207,13 +175,13 @@ class TestFileEditor:
         not hasattr(FileEditor, 'find_by_xpath'),
         reason="XPath support requires lxml"
     )
-    def test_set_element_text(self, sample_svg: str) -> None:
+    def test_set_element_text(self, svg_source: io.BytesIO) -> None:
         """Test setting element text
 
         Args:
-            sample_svg: Path to a sample SVG file (fixture)
+            svg_source: In-memory SVG document (fixture)
         """
-        editor = FileEditor(sample_svg)
+        editor = FileEditor(svg_source)
         xpath = "//text[@id='test-text']"
         success = editor.set_element_text(xpath, "Updated Text")
         assert success is True
@@ -226,13 +194,13 @@ class TestFileEditor:
         not hasattr(FileEditor, 'find_by_xpath'),
         reason="XPath support requires lxml"
     )
-    def test_set_element_attribute(self, sample_svg: str) -> None:
+    def test_set_element_attribute(self, svg_source: io.BytesIO) -> None:
         """Test setting element attribute
 
         Args:
-            sample_svg: Path to a sample SVG file (fixture)
+            svg_source: In-memory SVG document (fixture)
         """
-        editor = FileEditor(sample_svg)
+        editor = FileEditor(svg_source)
         xpath = "//rect[@id='test-rect']"
         success = editor.set_element_attribute(xpath, "fill", "blue")
         assert success is True
@@ -245,14 +213,131 @@ class TestFileEditor:
         not hasattr(FileEditor, 'find_by_xpath'),
         reason="XPath support requires lxml"
     )
-    def test_list_elements(self, sample_xml: str) -> None:
+    def test_list_elements(self, xml_source: io.BytesIO) -> None:
         """Test listing elements"""
-        editor = FileEditor(sample_xml)
+        editor = FileEditor(xml_source)
         elements = editor.list_elements("//record")
         assert len(elements) == 2
         assert elements[0]['tag'] == 'record'
         assert 'id' in elements[0]['attributes']
 
+    def test_list_elements_by_attribute(self, xml_source: io.BytesIO) -> None:
+        """Test listing elements filtered on an attribute value"""
+        editor = FileEditor(xml_source)
+        elements = editor.list_elements("//record[@id = '2']")
+        assert [el['attributes']['id'] for el in elements] == ['2']
+        assert editor.list_elements("//record[@id='3']") == []
+
+    def test_namespaced_attribute_predicate(self) -> None:
+        """Test that simple SVG queries match namespaced attributes like XPath"""
+        editor = FileEditor(io.BytesIO(
+            b'<svg xmlns="http://www.w3.org/2000/svg" '
+            b'xmlns:xlink="http://www.w3.org/1999/xlink">'
+            b'<use xlink:href="#a" x="5"/></svg>'
+        ))
+        xpath = "//use[@href='#a']"
+        assert len(editor.find_by_xpath(xpath)) == 1
+        assert len(list(editor.iter_by_xpath(xpath))) == 1
+        assert len(editor.list_elements(xpath)) == 1
+        assert editor.get_element_attribute(xpath, "x") == "5"
+
+    def test_count_elements(self, svg_source: io.BytesIO) -> None:
+        """Test counting elements without an XPath query"""
+        editor = FileEditor(svg_source)
+        assert editor.count_elements() == len(editor.find_by_xpath("//*"))
+
+    def test_parser_per_thread(self) -> None:
+        """Test that each thread parses with its own lxml parser"""
+        import threading
+        from xqr.core import parsers
+
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(parsers._lxml_parser('xml')))
+        thread.start()
+        thread.join()
+        assert seen[0] is not parsers._lxml_parser('xml')
+        assert parsers._lxml_parser('xml') is parsers._lxml_parser('svg')
+
+    def test_xpath_compiled_once(self, svg_source: io.BytesIO) -> None:
+        """Test that repeated queries reuse the compiled XPath expression"""
+        from xqr.core.xpath_utils import compile_xpath
+
+        editor = FileEditor(svg_source)
+        editor.get_element_text("//text[contains(@id, 'text')]")
+        hits = compile_xpath.cache_info().hits
+        assert editor.get_element_text("//text[contains(@id, 'text')]") == "Hello World"
+        assert compile_xpath.cache_info().hits == hits + 1
+
+    def test_first_match(self, xml_source: io.BytesIO) -> None:
+        """Test first-match lookups that skip the XPath engine"""
+        editor = FileEditor(xml_source)
+        assert editor.get_element_attribute("//record", "id") == "1"
+        assert editor.get_element_attribute('//record[@id="2"]', "id") == "2"
+        assert editor.get_element_attribute("//*[@id='3']", "id") == ""
+
+    def test_xpath_variables(self, svg_source: io.BytesIO) -> None:
+        """Test binding XPath variables instead of formatting values in"""
+        from xqr.core.xpath_utils import compile_xpath
+
+        editor = FileEditor(svg_source)
+        assert editor.find_by_xpath("//rect[@id=$id]", id="missing") == []
+        misses = compile_xpath.cache_info().misses
+        elements = editor.find_by_xpath("//rect[@id=$id]", id="test-rect")
+        assert [el.get("fill") for el in elements] == ["red"]
+        assert compile_xpath.cache_info().misses == misses
+
+    def test_xpath_wildcard_svg(self, svg_source: io.BytesIO) -> None:
+        """Test wildcard element steps in SVG XPath queries"""
+        editor = FileEditor(svg_source)
+        fill = editor.get_element_attribute("//*[@id='test-rect']", "fill")
+        assert fill == "red"
+
+    def test_xpath_svg_namespaces(self) -> None:
+        """Test SVG queries across namespaces and for added elements"""
+        editor = FileEditor(io.BytesIO(
+            b'<svg xmlns="http://www.w3.org/2000/svg"><rect id="a"/>'
+            b'<foreignObject><div xmlns="http://www.w3.org/1999/xhtml">Hi</div>'
+            b'</foreignObject></svg>'
+        ))
+        assert editor.get_element_text("//foreignObject/div") == "Hi"
+
+        editor.add_element("//svg", "rect", attributes={"id": "b"})
+        assert [el.get("id") for el in editor.find_by_xpath("//svg/rect")] == ["a", "b"]
+
+    def test_xpath_svg_mixed_namespaces(self) -> None:
+        """Test that SVG queries match elements from every namespace"""
+        editor = FileEditor(io.BytesIO(
+            b'<svg xmlns="http://www.w3.org/2000/svg"><title>Drawing</title>'
+            b'<foreignObject><title xmlns="http://www.w3.org/1999/xhtml">Page</title>'
+            b'</foreignObject></svg>'
+        ))
+        assert [el.text for el in editor.find_by_xpath("//title")] == ["Drawing", "Page"]
+
+        # Function expressions are evaluated, not rejected
+        editor.find_by_xpath("count(//title)")
+        assert editor.find_by_xpath("count(//*[local-name()='title'])") == 2.0
+
+    def test_xpath_string_results(self, svg_source: io.BytesIO) -> None:
+        """Test that attribute queries return plain strings"""
+        editor = FileEditor(svg_source)
+        assert editor.find_by_xpath("//rect/@fill") == ["red"]
+        assert editor.remove_element("//rect/@fill") is False
+
+    def test_get_by_id(self, svg_source: io.BytesIO) -> None:
+        """Test id lookups stay correct after the document is edited"""
+        editor = FileEditor(svg_source)
+        assert editor.get_by_id("test-rect").get("fill") == "red"
+        assert editor.get_by_id("missing") is None
+
+        editor.set_element_attribute("//rect", "id", "renamed")
+        assert editor.get_by_id("test-rect") is None
+        assert editor.get_by_id("renamed").get("fill") == "red"
+
+    def test_get_element_html(self) -> None:
+        """Test that element HTML excludes the text following the element"""
+        editor = FileEditor(io.BytesIO(b"<root><b>bold</b> tail</root>"))
+        assert editor.get_element_html("//b") == "<b>bold</b>"
+
     def test_backup_creation(self, sample_svg: str) -> None:
         """Test backup file creation"""
         editor = FileEditor(sample_svg)
@@ -261,10 +346,8 @@ class TestFileEditor:
         assert Path(backup_path).exists()
 
         # Verify backup content matches original
-        with open(backup_path, 'r', encoding='utf-8') as f:
-            backup_content = f.read()
-
-        assert backup_content == editor.original_content
+        backup_digest = hashlib.sha256(Path(backup_path).read_bytes()).hexdigest()
+        assert backup_digest == editor.original_digest
 
         os.unlink(backup_path)  # Cleanup backup file
 
@@ -292,17 +375,43 @@ class TestFileEditor:
         # Cleanup
         os.unlink(tmp_path)
 
-    def test_invalid_xpath(self, sample_svg: str) -> None:
+    def test_save_unmodified(self, sample_svg: str, tmp_path: Path) -> None:
+        """Test that save(only_if_modified=True) leaves an unchanged file alone"""
+        path = tmp_path / "unchanged.svg"
+        path.write_text(Path(sample_svg).read_text())
+        os.utime(path, ns=(0, 0))
+        editor = FileEditor(path)
+
+        assert editor.save(only_if_modified=True) is True
+        assert path.stat().st_mtime_ns == 0
+
+        # Elements changed directly are not tracked, so a plain save writes
+        editor.find_by_xpath("//text[@id='test-text']")[0].text = "Direct"
+        assert editor.save() is True
+        assert path.stat().st_mtime_ns != 0
+        assert "Direct" in path.read_text()
+
+        editor.set_element_text("//text[@id='test-text']", "Changed")
+        assert editor.modified is True
+        editor.save(only_if_modified=True)
+        assert editor.modified is False
+        assert "Changed" in path.read_text()
+
+    def test_invalid_xpath(self, svg_source: io.BytesIO) -> None:
         """Test handling of invalid XPath expressions"""
-        editor = FileEditor(sample_svg)
+        editor = FileEditor(svg_source)
 
         if hasattr(editor, 'find_by_xpath'):
             with pytest.raises(ValueError):
                 editor.find_by_xpath("invalid[xpath[")
 
-    def test_nonexistent_element(self, sample_svg: str) -> None:
+            # The error shows the expression as given, not the SVG rewrite
+            with pytest.raises(ValueError, match=r"^Invalid XPath expression: //text\[1 \+\]$"):
+                editor.find_by_xpath("//text[1 +]")
+
+    def test_nonexistent_element(self, svg_source: io.BytesIO) -> None:
         """Test querying non-existent elements"""
-        editor = FileEditor(sample_svg)
+        editor = FileEditor(svg_source)
 
         if hasattr(editor, 'find_by_xpath'):
             # Test the find_by_xpath method
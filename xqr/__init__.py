@@ -3,10 +3,8 @@ XQR (XPath Query & Replace) - CLI tool for editing SVG, HTML, and XML files
 using XPath and CSS selectors.
 """
 
-from .core.editor import FileEditor
-from .core.examples import create_example_files
-from .server.server import FileEditorServer, start_server
-from .cli import CLI
+import importlib
+from typing import Any
 
 __version__ = "0.1.2"  # Updated version for server refactoring
 __author__ = "Tom Sapletta"
@@ -20,3 +18,26 @@ __all__ = [
     "create_example_files",
     "start_server"
 ]
+
+# Public names and the modules that define them. They are imported on first
+# access (PEP 562), so e.g. running the CLI never loads the HTTP server.
+_LAZY_IMPORTS = {
+    "FileEditor": ".core.editor",
+    "create_example_files": ".core.examples",
+    "FileEditorServer": ".server.server",
+    "start_server": ".server.server",
+    "CLI": ".cli",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list:
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
@@ -3,46 +3,69 @@ Command modules for the XQR CLI.
 
 This package contains command implementations for the XQR command-line interface.
 Each command is implemented as a separate module that defines a Command class.
+Command modules are only imported when their command is used; listing the
+available commands and their help text only needs ``COMMAND_INFO``.
 """
 
-from typing import Dict, Type
+import importlib
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Type
+
 from .base import BaseCommand
 
-# Import all command classes here
-from .load import LoadCommand
-from .query import QueryCommand
-from .set import SetCommand
-from .save import SaveCommand
-from .create import CreateCommand
-from .ls import LsCommand
-from .shell import ShellCommand
-from .examples import ExamplesCommand
-from .server import ServerCommand
-
-# Map of command names to their corresponding command classes
-COMMANDS: Dict[str, Type[BaseCommand]] = {
-    'load': LoadCommand,
-    'query': QueryCommand,
-    'get': QueryCommand,  # Alias for query
-    'set': SetCommand,
-    'save': SaveCommand,
-    'create': CreateCommand,
-    'ls': LsCommand,
-    'shell': ShellCommand,
-    'examples': ExamplesCommand,
-    'server': ServerCommand,
+
+class CommandInfo(NamedTuple):
+    """Static description of a command, available without importing it."""
+    module: str
+    class_name: str
+    help: str
+    requires_editor: bool
+
+
+# Map of command names to their metadata. ``help`` and ``requires_editor``
+# must match the attributes of the command class.
+COMMAND_INFO: Dict[str, CommandInfo] = {
+    'load': CommandInfo('.load', 'LoadCommand', "Load a file for editing", False),
+    'query': CommandInfo('.query', 'QueryCommand', "Query elements using XPath (alias: get)", True),
+    'get': CommandInfo('.query', 'QueryCommand', "Query elements using XPath (alias: get)", True),
+    'set': CommandInfo('.set', 'SetCommand', "Set element content or attributes using XPath", True),
+    'save': CommandInfo('.save', 'SaveCommand', "Save the current file", True),
+    'create': CommandInfo('.create', 'CreateCommand', "Create a new element using XPath", True),
+    'ls': CommandInfo('.ls', 'LsCommand', "List elements matching an XPath expression", True),
+    'shell': CommandInfo('.shell', 'ShellCommand', "Start an interactive shell", False),
+    'examples': CommandInfo('.examples', 'ExamplesCommand', "Show usage examples", False),
+    'server': CommandInfo('.server', 'ServerCommand', "Start a web server for the current file", True),
 }
 
+_CLASS_MODULES = {info.class_name: info.module for info in COMMAND_INFO.values()}
+
+
+@lru_cache(maxsize=None)
 def get_command_class(command_name: str) -> Type[BaseCommand]:
     """Get the command class for the given command name.
-    
+
+    The command's module is imported on first use and the class is cached,
+    so repeated lookups (e.g. from the interactive shell) are a dict hit.
+
     Args:
         command_name: Name of the command
-        
+
     Returns:
         The command class
-        
+
     Raises:
         KeyError: If the command is not found
     """
-    return COMMANDS[command_name]
+    info = COMMAND_INFO[command_name]
+    module = importlib.import_module(info.module, __name__)
+    return getattr(module, info.class_name)
+
+
+def __getattr__(name: str) -> Any:
+    # Command classes and the full COMMANDS map are still importable from
+    # here, but are only loaded when asked for
+    if name in _CLASS_MODULES:
+        return getattr(importlib.import_module(_CLASS_MODULES[name], __name__), name)
+    if name == 'COMMANDS':
+        return {cmd_name: get_command_class(cmd_name) for cmd_name in COMMAND_INFO}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,9 +1,10 @@
 """Base command class for XQR CLI commands."""
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 import argparse
 from pathlib import Path
 
-from xqr.core import FileEditor
+if TYPE_CHECKING:
+    from xqr.core import FileEditor
 
 
 class BaseCommand:
@@ -30,7 +31,7 @@ class BaseCommand:
         pass
     
     @classmethod
-    def execute(cls, args: argparse.Namespace, editor: Optional[FileEditor] = None) -> int:
+    def execute(cls, args: argparse.Namespace, editor: Optional['FileEditor'] = None) -> int:
         """Execute the command.
         
         Args:
@@ -58,7 +59,7 @@ class BaseCommand:
         return True
     
     @classmethod
-    def check_editor_required(cls, editor: Optional[FileEditor]) -> bool:
+    def check_editor_required(cls, editor: Optional['FileEditor']) -> bool:
         """Check if the command can be executed with the current editor state.
         
         Args:
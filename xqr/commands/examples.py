@@ -1,10 +1,12 @@
 """Examples command for XQR CLI."""
 import argparse
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from xqr.core import FileEditor, create_example_files
 from .base import BaseCommand
 
+if TYPE_CHECKING:
+    from xqr.core import FileEditor
+
 
 class ExamplesCommand(BaseCommand):
     """Show usage examples."""
@@ -14,7 +16,7 @@ class ExamplesCommand(BaseCommand):
     requires_editor = False
     
     @classmethod
-    def execute(cls, args: argparse.Namespace, editor: Optional[FileEditor] = None) -> int:
+    def execute(cls, args: argparse.Namespace, editor: Optional['FileEditor'] = None) -> int:
         """Execute the examples command."""
         examples = """
 XQR Usage Examples:
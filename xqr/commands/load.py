@@ -18,6 +18,11 @@ class LoadCommand(BaseCommand):
     @classmethod
     def add_arguments(cls, parser: argparse.ArgumentParser) -> None:
         parser.add_argument('file', help='File to load')
+        parser.add_argument(
+            '--subtree',
+            metavar='TAG',
+            help='Only load the first element with this tag (for large files)'
+        )
     
     @classmethod
     def execute(cls, args: argparse.Namespace, editor: Optional[FileEditor] = None) -> int:
@@ -30,10 +35,14 @@ class LoadCommand(BaseCommand):
             
         try:
             # Create a new editor instance with the file
-            new_editor = FileEditor(file_path)
+            subtree = getattr(args, 'subtree', None)
+            new_editor = FileEditor(file_path, subtree=subtree)
             # Update the current file in state
-            set_current_file(str(file_path))
-            print(f"✅ Loaded {file_path} ({new_editor.file_type})")
+            set_current_file(str(file_path), subtree=subtree)
+            if subtree:
+                print(f"✅ Loaded <{subtree}> from {file_path} ({new_editor.file_type})")
+            else:
+                print(f"✅ Loaded {file_path} ({new_editor.file_type})")
             return 0
         except Exception as e:
             print(f"❌ Error loading file: {e}")
@@ -40,7 +40,7 @@ class SetCommand(BaseCommand):
                 action = f"set content to '{args.value}'"
                 
             if success:
-                print(f"✅ Updated {args.xpath} - {action}")
+                print(f"✅ Element updated: {args.xpath} - {action}")
                 return 0
             else:
                 print(f"❌ Failed to update {args.xpath}")
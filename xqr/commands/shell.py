@@ -1,13 +1,30 @@
 """Shell command for XQR CLI."""
 import argparse
 import cmd
+import glob
+import os
+import shlex
 import sys
+from functools import lru_cache
 from typing import Optional, List, Dict, Any
 
 from xqr.core import FileEditor
-from xqr.state import get_current_file, set_current_file
+from xqr.state import STATE_DIR, ensure_state_dir, get_current_file, set_current_file
 from .base import BaseCommand
 
+# Command history is kept next to the CLI state
+HISTORY_FILE = STATE_DIR / "history"
+HISTORY_LENGTH = 1000
+
+
+@lru_cache(maxsize=None)
+def _command_parser(cmd_name: str) -> argparse.ArgumentParser:
+    """Build the argument parser for a shell command, once per session."""
+    from xqr.commands import get_command_class
+    parser = argparse.ArgumentParser(prog=cmd_name, add_help=False)
+    get_command_class(cmd_name).add_arguments(parser)
+    return parser
+
 
 class XQRShell(cmd.Cmd):
     """Interactive shell for XQR."""
@@ -21,19 +38,14 @@ class XQRShell(cmd.Cmd):
         self._load_commands()
     
     def _load_commands(self) -> None:
-        """Load available commands dynamically."""
-        from xqr.commands import get_command_class
-        self.commands: Dict[str, Any] = {}
+        """Load the metadata of the available commands.
         
-        # Import commands to register them
-        import xqr.commands  # This will register commands via __init__.py
-        
-        # Get all registered commands
-        for cmd_name in ['load', 'query', 'get', 'set', 'save', 'create', 'ls', 'examples', 'server']:
-            try:
-                self.commands[cmd_name] = get_command_class(cmd_name)
-            except KeyError:
-                pass
+        Command classes are imported when a command is first run.
+        """
+        from xqr.commands import COMMAND_INFO
+        self.commands: Dict[str, Any] = {
+            name: info for name, info in COMMAND_INFO.items() if name != 'shell'
+        }
     
     def emptyline(self) -> bool:
         """Do nothing on empty input."""
@@ -49,8 +61,8 @@ class XQRShell(cmd.Cmd):
         if arg:
             # Show help for specific command
             if arg in self.commands:
-                cmd_class = self.commands[arg]
-                print(f"\n{cmd_class.help}")
+                cmd_info = self.commands[arg]
+                print(f"\n{cmd_info.help}")
                 print("\nUsage:")
                 print(f"  {arg} [options]")
                 return
@@ -59,8 +71,8 @@ class XQRShell(cmd.Cmd):
         
         # Show general help
         print("\nAvailable commands:")
-        for name, cmd_class in sorted(self.commands.items()):
-            print(f"  {name:<10} {cmd_class.help}")
+        for name, cmd_info in sorted(self.commands.items()):
+            print(f"  {name:<10} {cmd_info.help}")
         print("\nType 'help <command>' for help on a specific command.")
     
     def do_exit(self, _: str) -> bool:
@@ -76,6 +88,13 @@ class XQRShell(cmd.Cmd):
         """Load a file."""
         self._execute_command('load', arg)
     
+    def complete_load(self, text: str, line: str, begidx: int, endidx: int) -> List[str]:
+        """Complete file paths for the load command."""
+        return [
+            path + os.sep if os.path.isdir(path) else path
+            for path in glob.glob(glob.escape(text) + '*')
+        ]
+    
     def do_query(self, arg: str) -> None:
         """Query elements using XPath."""
         self._execute_command('query', arg)
@@ -111,15 +130,14 @@ class XQRShell(cmd.Cmd):
     def _execute_command(self, cmd_name: str, args_str: str) -> None:
         """Execute a command with the given arguments."""
         try:
-            cmd_class = self.commands[cmd_name]
+            from xqr.commands import get_command_class
+            cmd_class = get_command_class(cmd_name)
             
-            # Parse arguments
-            parser = argparse.ArgumentParser(prog=cmd_name, add_help=False)
-            cmd_class.add_arguments(parser)
+            # Parse arguments with the command's cached parser
+            parser = _command_parser(cmd_name)
             
             try:
                 # Split args string into a list, handling quoted strings
-                import shlex
                 args_list = shlex.split(args_str) if args_str else []
                 args = parser.parse_args(args_list)
             except SystemExit:
@@ -159,6 +177,7 @@ class ShellCommand(BaseCommand):
         if editor:
             print(f"Currently loaded: {editor.file_path} ({editor.file_type})\n")
         
+        readline = _load_history()
         try:
             shell = XQRShell(editor=editor)
             shell.cmdloop()
@@ -169,3 +188,34 @@ class ShellCommand(BaseCommand):
         except Exception as e:
             print(f"❌ Error in shell: {e}")
             return 1
+        finally:
+            _save_history(readline)
+
+
+def _load_history() -> Any:
+    """Enable readline history, if available, and load earlier sessions.
+    
+    Returns:
+        The readline module, or None if it is not available
+    """
+    try:
+        import readline
+    except ImportError:  # e.g. Windows without pyreadline
+        return None
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except OSError:
+        pass  # No history yet
+    readline.set_history_length(HISTORY_LENGTH)
+    return readline
+
+
+def _save_history(readline: Any) -> None:
+    """Write the shell history back to disk."""
+    if readline is None:
+        return
+    try:
+        ensure_state_dir()
+        readline.write_history_file(HISTORY_FILE)
+    except OSError:
+        pass
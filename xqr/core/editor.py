@@ -5,14 +5,39 @@ This module provides the FileEditor class which serves as the main interface
 for working with XML/HTML/SVG files.
 """
 
+import hashlib
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple, Union
 
 from . import parsers
 from . import operations
 from .xpath_utils import find_elements_by_xpath, find_elements_by_css
 
+# Parsed documents (tree, root, file_type) shared between read-only
+# FileEditor instances, keyed by (path, mtime_ns, size) so that a modified
+# file is never served stale.
+_TREE_CACHE: Dict[Tuple[str, int, int], Tuple[Any, Any, str]] = {}
+_TREE_CACHE_SIZE = 8
+
+
+def _sha256_file(file_path: Path) -> str:
+    """Return the SHA-256 hex digest of a file, read in 1 MiB chunks."""
+    with open(file_path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+def _invalidate_cache(file_path: Path) -> None:
+    """Drop all cached trees for a file path."""
+    path = os.path.abspath(file_path)
+    for key in [key for key in _TREE_CACHE if key[0] == path]:
+        del _TREE_CACHE[key]
+
 
 class FileEditor:
     """Main class for editing XML/HTML/SVG files.
@@ -21,23 +46,127 @@ class FileEditor:
     modifying XML, HTML, and SVG files.
     """
 
-    def __init__(self, file_path: Union[str, os.PathLike]) -> None:
-        """Initialize FileEditor with a file path.
+    def __init__(
+        self,
+        file_path: Union[str, os.PathLike, IO],
+        readonly: bool = False,
+        subtree: Optional[str] = None
+    ) -> None:
+        """Initialize FileEditor with a file path or an in-memory source.
         
         Args:
-            file_path: Path to the file to edit
+            file_path: Path to the file to edit, or a file-like object
+                (e.g. ``io.BytesIO``) to parse without touching the disk.
+                In-memory documents have no ``file_path`` and must be saved
+                with an explicit output path.
+            readonly: Promise not to modify the document. Read-only editors
+                of an unchanged file share one cached tree instead of each
+                parsing the file, so the editing methods and :meth:`save`
+                refuse to run on them.
+            subtree: Only load the first element with this tag name, see
+                :meth:`from_subtree`.
             
         Raises:
             FileNotFoundError: If the file does not exist
             ValueError: If the file cannot be parsed
         """
-        self.file_path = Path(file_path)
+        self.file_path = None
         self.tree = None
         self.root = None
         self.file_type = None
-        self.original_content = None
+        self.readonly = readonly
+        self.subtree = subtree
+        self._content = None
+        self._digest: Optional[str] = None
+        # (mtime_ns, size) of the file when it was loaded
+        self._source_stat: Optional[Tuple[int, int]] = None
+        self._id_index: Optional[Dict[str, Any]] = None
+        # Set by the editing methods, see save(only_if_modified=True)
+        self.modified = False
+        
+        if hasattr(file_path, 'read'):
+            content = file_path.read()
+            if isinstance(content, bytes):
+                content = content.decode('utf-8')
+            self._content = content
+        else:
+            self.file_path = Path(file_path)
         self._load_file()
 
+    @classmethod
+    def from_subtree(
+        cls,
+        file_path: Union[str, os.PathLike],
+        tag: str,
+        readonly: bool = False
+    ) -> 'FileEditor':
+        """Load only the first element with the given tag from a file.
+        
+        The file is streamed and parsing stops once the element is complete,
+        which keeps memory use low for large documents when only one part
+        is of interest. The editor's tree is the detached subtree, so it
+        cannot be saved back over the original file.
+        
+        Args:
+            file_path: Path to the file to edit
+            tag: Tag name of the subtree root (any namespace)
+            readonly: See :class:`FileEditor`
+            
+        Returns:
+            FileEditor for the subtree
+            
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file cannot be parsed or has no such element
+        """
+        return cls(file_path, readonly=readonly, subtree=tag)
+
+    @property
+    def original_content(self) -> str:
+        """Source text of the document as it was loaded.
+        
+        For files the text is not kept in memory after parsing; it is read
+        back from disk on first use, which is only possible while the file
+        is unchanged since it was loaded. Use :meth:`backup` before saving
+        over the file to keep the old text around.
+        
+        Raises:
+            IOError: If the file has changed since it was loaded
+        """
+        if self._content is None:
+            self._check_source()
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                self._content = f.read()
+        return self._content
+
+    @property
+    def original_digest(self) -> str:
+        """SHA-256 hex digest of the document as it was loaded.
+        
+        Computed on first use, see :attr:`original_content`.
+        
+        Raises:
+            IOError: If the file has changed since it was loaded
+        """
+        if self._digest is None:
+            if self.file_path is None:
+                self._digest = hashlib.sha256(self._content.encode('utf-8')).hexdigest()
+            else:
+                self._check_source()
+                self._digest = _sha256_file(self.file_path)
+        return self._digest
+
+    def _check_source(self) -> None:
+        """Raise IOError if the file is no longer the one that was loaded."""
+        stat = self.file_path.stat()
+        if (stat.st_mtime_ns, stat.st_size) != self._source_stat:
+            raise IOError(f"{self.file_path} has changed since it was loaded")
+
+    def _check_writable(self) -> None:
+        """Raise PermissionError if the editor was opened read-only."""
+        if self.readonly:
+            raise PermissionError(f"{self.file_path or 'Document'} was opened read-only")
+
     def _load_file(self) -> None:
         """Load and parse the file.
         
@@ -45,18 +174,105 @@ class FileEditor:
             FileNotFoundError: If the file does not exist
             ValueError: If the file cannot be parsed
         """
-        self.tree, self.root, self.file_type, self.original_content = \
-            parsers.parse_file(self.file_path)
+        if self.file_path is None:
+            try:
+                self.tree, self.root, self.file_type = \
+                    parsers.parse_content(self._content)
+            except Exception as e:
+                raise ValueError(f"Failed to parse document: {e}")
+            return
+        
+        try:
+            stat = self.file_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {self.file_path}")
+        self._source_stat = (stat.st_mtime_ns, stat.st_size)
+        self._content = None
+        
+        if self.subtree:
+            self.tree, self.root, self.file_type = \
+                parsers.parse_subtree(self.file_path, self.subtree)
+            return
+        
+        if not self.readonly:
+            # Writable editors get a tree of their own. Copying a cached tree
+            # costs as much as parsing the file again, so they bypass the cache.
+            self.tree, self.root, self.file_type, _ = parsers.parse_file(self.file_path)
+            return
+        
+        key = (os.path.abspath(self.file_path),) + self._source_stat
+        cached = _TREE_CACHE.get(key)
+        if cached is None:
+            tree, root, file_type, _ = parsers.parse_file(self.file_path)
+            cached = (tree, root, file_type)
+            if len(_TREE_CACHE) >= _TREE_CACHE_SIZE:
+                del _TREE_CACHE[next(iter(_TREE_CACHE))]
+            _TREE_CACHE[key] = cached
+        
+        self.tree, self.root, self.file_type = cached
 
     def reload(self) -> None:
-        """Reload the file from disk, discarding any unsaved changes."""
+        """Reload the file from disk, discarding any unsaved changes.
+        
+        In-memory documents are re-parsed from their original content.
+        """
+        self._id_index = None
+        self._digest = None
+        self.modified = False
         self._load_file()
 
-    def find_by_xpath(self, xpath: str) -> List[Any]:
+    def _build_id_index(self) -> Dict[str, Any]:
+        """Map each id attribute value to the first element carrying it."""
+        index: Dict[str, Any] = {}
+        for element in self.tree.iter():
+            if not isinstance(element.tag, str):
+                continue  # comments and processing instructions
+            id_value = element.get('id')
+            if id_value and id_value not in index:
+                index[id_value] = element
+        self._id_index = index
+        return index
+
+    def get_by_id(self, id_value: str) -> Optional[Any]:
+        """Find the element with the given id attribute.
+        
+        An id index is built on first use, so repeated lookups are O(1)
+        instead of an XPath scan of the whole document. Entries are checked
+        on every lookup and the index is rebuilt when the document has been
+        edited since.
+        
+        Args:
+            id_value: Value of the id attribute
+            
+        Returns:
+            The first element with that id, or None if there is none
+        """
+        index = self._id_index
+        if index is None:
+            index = self._build_id_index()
+        element = index.get(id_value)
+        if element is not None and self._id_entry_valid(element, id_value):
+            return element
+        
+        # Missing or stale entry: the tree may have changed, so rebuild once
+        element = self._build_id_index().get(id_value)
+        return element
+
+    def _id_entry_valid(self, element: Any, id_value: str) -> bool:
+        """Check that an indexed element still has the id and is in the tree."""
+        if element.get('id') != id_value:
+            return False
+        if not hasattr(element, 'getroottree'):
+            return True
+        return element.getroottree().getroot() is self.tree.getroottree().getroot()
+
+    def find_by_xpath(self, xpath: str, **variables: Any) -> List[Any]:
         """Find elements using XPath with namespace support.
         
         Args:
             xpath: XPath expression to find elements
+            **variables: Values for ``$name`` variables in the expression,
+                e.g. ``find_by_xpath("//rect[@id=$id]", id="r1")``
             
         Returns:
             List of matching elements
@@ -64,7 +280,25 @@ class FileEditor:
         Raises:
             ValueError: If the XPath expression is invalid
         """
-        return find_elements_by_xpath(self.tree, xpath, self.file_type)
+        return find_elements_by_xpath(self.tree, xpath, self.file_type, **variables)
+
+    def iter_by_xpath(self, xpath: str) -> Iterator[Any]:
+        """Iterate over the elements matching an XPath expression.
+        
+        Like :meth:`find_by_xpath`, but simple ``//tag`` queries (optionally
+        with one ``[@attr='value']`` predicate) yield matches while walking
+        the tree instead of building the full result list first.
+        
+        Args:
+            xpath: XPath expression to find elements
+            
+        Returns:
+            Iterator over the matching elements
+            
+        Raises:
+            ValueError: If the XPath expression is invalid
+        """
+        return operations.iter_by_xpath(self.tree, xpath, self.file_type)
 
     def find_by_css(self, css_selector: str) -> List[Any]:
         """Find elements using CSS selectors (HTML only).
@@ -129,7 +363,8 @@ class FileEditor:
                     element,
                     encoding='unicode',
                     method='html' if self.file_type == 'html' else 'xml',
-                    pretty_print=True
+                    pretty_print=True,
+                    with_tail=False
                 ).strip()
             except ImportError:
                 # Fall back to ElementTree
@@ -157,7 +392,10 @@ class FileEditor:
         Returns:
             True if the element was found and updated, False otherwise
         """
-        return operations.set_element_text(self.tree, xpath, new_text, self.file_type)
+        self._check_writable()
+        changed = operations.set_element_text(self.tree, xpath, new_text, self.file_type)
+        self.modified |= changed
+        return changed
 
     def set_element_attribute(self, xpath: str, attr_name: str, attr_value: str) -> bool:
         """Set an attribute value on the first element matching the XPath.
@@ -170,9 +408,12 @@ class FileEditor:
         Returns:
             True if the element was found and updated, False otherwise
         """
-        return operations.set_element_attribute(
+        self._check_writable()
+        changed = operations.set_element_attribute(
             self.tree, xpath, attr_name, attr_value, self.file_type
         )
+        self.modified |= changed
+        return changed
 
     def add_element(
         self,
@@ -192,9 +433,12 @@ class FileEditor:
         Returns:
             True if the parent was found and the element was added, False otherwise
         """
-        return operations.add_element(
+        self._check_writable()
+        changed = operations.add_element(
             self.tree, parent_xpath, tag_name, text, attributes, self.file_type
         )
+        self.modified |= changed
+        return changed
 
     def remove_element(self, xpath: str) -> bool:
         """Remove the first element matching the XPath.
@@ -205,7 +449,18 @@ class FileEditor:
         Returns:
             True if the element was found and removed, False otherwise
         """
-        return operations.remove_element(self.tree, xpath, self.file_type)
+        self._check_writable()
+        changed = operations.remove_element(self.tree, xpath, self.file_type)
+        self.modified |= changed
+        return changed
+
+    def count_elements(self) -> int:
+        """Count the elements in the document.
+        
+        Returns:
+            Number of elements, including the root
+        """
+        return operations.count_elements(self.tree)
 
     def list_elements(self, xpath: str = "//*") -> List[Dict]:
         """List elements matching the XPath with their properties.
@@ -218,21 +473,43 @@ class FileEditor:
         """
         return operations.list_elements(self.tree, xpath, self.file_type)
 
-    def save(self, output_path: Optional[Union[str, os.PathLike]] = None) -> bool:
+    def save(
+        self,
+        output_path: Optional[Union[str, os.PathLike]] = None,
+        only_if_modified: bool = False
+    ) -> bool:
         """Save changes to a file.
         
         Args:
             output_path: Path to save the file to. If not provided, overwrites the original file.
+            only_if_modified: Skip rewriting the original file when no editing
+                method has changed the document. Elements changed directly
+                (e.g. through ``find_by_xpath`` results) are not tracked, so
+                callers doing that must set ``modified`` themselves.
             
         Returns:
             True if the file was saved successfully, False otherwise
             
         Raises:
             IOError: If there was an error writing the file
+            PermissionError: If the editor was opened read-only
         """
+        self._check_writable()
         save_path = Path(output_path) if output_path else self.file_path
+        if save_path is None:
+            raise IOError("No output path given for an in-memory document")
+        if self.subtree and not output_path:
+            raise IOError(
+                f"Refusing to overwrite {self.file_path} with its <{self.subtree}> "
+                "subtree; give an output path"
+            )
+        if only_if_modified and not self.modified and save_path == self.file_path:
+            return True  # Nothing to write back
         save_path.parent.mkdir(parents=True, exist_ok=True)
         
+        overwrite = self.file_path is not None and save_path.exists() \
+            and save_path.samefile(self.file_path)
+        
         try:
             # Try lxml first if available
             try:
@@ -281,10 +558,10 @@ class FileEditor:
             # Write to file
             with open(save_path, 'w', encoding='utf-8') as f:
                 f.write(content)
+            _invalidate_cache(save_path)
             
-            # Update original content if saving to the same file
-            if save_path.samefile(self.file_path):
-                self.original_content = content
+            if overwrite:
+                self.modified = False
                 
             return True
             
@@ -303,6 +580,8 @@ class FileEditor:
         Raises:
             IOError: If the backup could not be created
         """
+        if self.file_path is None:
+            raise IOError("Cannot back up an in-memory document")
         backup_path = self.file_path.with_suffix(self.file_path.suffix + suffix)
         try:
             import shutil
@@ -6,45 +6,27 @@ and testing purposes.
 """
 
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
-
-def create_example_files(directory: Optional[str] = None) -> None:
-    """Create example files for demonstration purposes.
-
-    Creates three example files: example.svg, example.xml, and example.html
-    with sample content for testing the editor.
-
-    Args:
-        directory: Optional directory path where to create the example files.
-                  If not provided, files will be created in the current working directory.
-    """
-    # Determine the target directory
-    target_dir = Path(directory) if directory else Path.cwd()
-    target_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Example SVG file
-    svg_content = """<?xml version="1.0" encoding="UTF-8"?>
+# Example files and their content, already encoded for writing
+_EXAMPLE_FILES: Dict[str, bytes] = {
+    "example.svg": b"""<?xml version="1.0" encoding="UTF-8"?>
 <svg width="200" height="100" xmlns="http://www.w3.org/2000/svg">
   <rect width="200" height="100" fill="#f0f0f0"/>
   <text x="100" y="50" font-family="Arial" font-size="16"
         text-anchor="middle" id="text1">Hello SVG</text>
   <text x="100" y="80" font-family="Arial" font-size="12"
         text-anchor="middle" id="text2">Edit me!</text>
-</svg>"""
-    
-    # Example XML file
-    xml_content = """<?xml version="1.0" encoding="UTF-8"?>
+</svg>""",
+    "example.xml": b"""<?xml version="1.0" encoding="UTF-8"?>
 <root>
   <greeting>Hello World</greeting>
   <items>
     <item id="1">First item</item>
     <item id="2">Second item</item>
   </items>
-</root>"""
-    
-    # Example HTML file
-    html_content = """<!DOCTYPE html>
+</root>""",
+    "example.html": b"""<!DOCTYPE html>
 <html>
 <head>
   <title>Example</title>
@@ -61,19 +43,28 @@ def create_example_files(directory: Optional[str] = None) -> None:
     <li>Item 2</li>
   </ul>
 </body>
-</html>"""
+</html>""",
+}
+
+
+def create_example_files(directory: Optional[str] = None) -> None:
+    """Create example files for demonstration purposes.
+
+    Creates three example files: example.svg, example.xml, and example.html
+    with sample content for testing the editor.
+
+    Args:
+        directory: Optional directory path where to create the example files.
+                  If not provided, files will be created in the current working directory.
+    """
+    # Determine the target directory
+    target_dir = Path(directory) if directory else Path.cwd()
+    target_dir.mkdir(parents=True, exist_ok=True)
     
     # Write files
-    files = {
-        "example.svg": svg_content,
-        "example.xml": xml_content,
-        "example.html": html_content
-    }
-    
-    for filename, content in files.items():
+    for filename, content in _EXAMPLE_FILES.items():
         filepath = target_dir / filename
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        filepath.write_bytes(content)
         print(f"Created example file: {filepath}")
 
 
@@ -5,11 +5,72 @@ This module provides the core functionality for manipulating XML/HTML/SVG docume
 including getting, setting, adding, and removing elements.
 """
 
-from typing import Any, Dict, List, Optional, Union
+import re
+from typing import Any, Dict, Iterator, List, Optional, Union
 from pathlib import Path
 
 from .xpath_utils import find_elements_by_xpath
 
+# "//tag" queries, which can be answered by iterating the tree
+_DESCENDANT_TAG = re.compile(r'^//([A-Za-z_][\w.-]*)$')
+
+# "//tag[@attr='value']" queries, also answered by iterating the tree
+_DESCENDANT_ATTR = re.compile(
+    r"""^//([A-Za-z_][\w.-]*|\*)\[@([A-Za-z_][\w.-]*)\s*=\s*(['"])(.*?)\3\]$"""
+)
+
+
+def _iter_simple(tree: Any, xpath: str, file_type: str) -> Optional[Iterator[Any]]:
+    """Iterate the matches of a simple query without the XPath engine.
+    
+    Handles ``//tag`` and ``//tag[@attr='value']``: the tag test runs inside
+    lxml's ``iter()`` and only the attribute comparison is done in Python.
+    
+    Returns:
+        An iterator over the matching elements, or None if the query is not
+        a simple one
+    """
+    match = _DESCENDANT_TAG.match(xpath) or _DESCENDANT_ATTR.match(xpath)
+    if not match or not hasattr(tree, 'getroottree'):
+        return None
+    
+    # SVG elements are namespaced, so match the tag in any namespace there
+    tag = match.group(1)
+    if file_type == 'svg':
+        tag = '{*}' + tag
+    candidates = tree.getroottree().getroot().iter(tag)
+    if match.re is _DESCENDANT_TAG:
+        return candidates
+    attr_name, attr_value = match.group(2, 4)
+    if file_type == 'svg':
+        # Like the @*[local-name()=...] rewrite, accept the attribute in any
+        # namespace (e.g. xlink:href for @href)
+        return (element for element in candidates
+                if _has_local_attr(element, attr_name, attr_value))
+    return (element for element in candidates if element.get(attr_name) == attr_value)
+
+
+def _has_local_attr(element: Any, attr_name: str, attr_value: str) -> bool:
+    """Check for an attribute with this local name and value in any namespace."""
+    if element.get(attr_name) == attr_value:
+        return True
+    suffix = '}' + attr_name
+    return any(name.endswith(suffix) and value == attr_value
+               for name, value in element.attrib.items())
+
+
+def _first_match(tree: Any, xpath: str, file_type: str = 'xml') -> Any:
+    """Return the first result of an XPath query, or None if there is none.
+    
+    Simple queries stop at the first hit instead of collecting every match.
+    """
+    matches = _iter_simple(tree, xpath, file_type)
+    if matches is not None:
+        return next(matches, None)
+    
+    elements = find_elements_by_xpath(tree, xpath, file_type)
+    return elements[0] if elements else None
+
 
 def get_element_text(tree: Any, xpath: str, file_type: str = 'xml') -> str:
     """Get the text content of the first element matching the XPath.
@@ -22,9 +83,8 @@ def get_element_text(tree: Any, xpath: str, file_type: str = 'xml') -> str:
     Returns:
         Text content of the element, or empty string if not found
     """
-    elements = find_elements_by_xpath(tree, xpath, file_type)
-    if elements:
-        element = elements[0]
+    element = _first_match(tree, xpath, file_type)
+    if element is not None:
         if hasattr(element, 'text'):
             return element.text or ""
         return str(element)
@@ -43,9 +103,8 @@ def get_element_attribute(tree: Any, xpath: str, attr_name: str, file_type: str
     Returns:
         Attribute value, or empty string if not found
     """
-    elements = find_elements_by_xpath(tree, xpath, file_type)
-    if elements:
-        element = elements[0]
+    element = _first_match(tree, xpath, file_type)
+    if element is not None:
         if hasattr(element, 'get'):
             return element.get(attr_name, "")
         elif hasattr(element, 'attrib'):
@@ -65,9 +124,9 @@ def set_element_text(tree: Any, xpath: str, new_text: str, file_type: str = 'xml
     Returns:
         True if the element was found and updated, False otherwise
     """
-    elements = find_elements_by_xpath(tree, xpath, file_type)
-    if elements and hasattr(elements[0], 'text'):
-        elements[0].text = new_text
+    element = _first_match(tree, xpath, file_type)
+    if element is not None and hasattr(element, 'text'):
+        element.text = new_text
         return True
     return False
 
@@ -91,11 +150,10 @@ def set_element_attribute(
     Returns:
         True if the element was found and updated, False otherwise
     """
-    elements = find_elements_by_xpath(tree, xpath, file_type)
-    if not elements:
+    element = _first_match(tree, xpath, file_type)
+    if element is None:
         return False
         
-    element = elements[0]
     if hasattr(element, 'set'):
         element.set(attr_name, attr_value)
     elif hasattr(element, 'attrib'):
@@ -132,6 +190,12 @@ def add_element(
     try:
         # Try lxml.etree first
         from lxml import etree
+        if file_type == 'svg' and not tag_name.startswith('{'):
+            # Create the element in the parent's namespace, as it will be
+            # once the saved file is read back
+            namespace = etree.QName(parent).namespace
+            if namespace:
+                tag_name = f'{{{namespace}}}{tag_name}'
         new_element = etree.SubElement(parent, tag_name)
     except (ImportError, AttributeError):
         # Fall back to ElementTree
@@ -164,6 +228,9 @@ def remove_element(tree: Any, xpath: str, file_type: str = 'xml') -> bool:
         return False
         
     element = elements[0]
+    if not hasattr(element, 'getparent'):
+        # Text and attribute results are plain strings, not elements
+        return False
     parent = element.getparent()
     if parent is not None:
         parent.remove(element)
@@ -171,6 +238,52 @@ def remove_element(tree: Any, xpath: str, file_type: str = 'xml') -> bool:
     return False
 
 
+def iter_by_xpath(tree: Any, xpath: str, file_type: str = 'xml') -> Iterator[Any]:
+    """Iterate over the results of an XPath query.
+    
+    Simple ``//tag`` and ``//tag[@attr='value']`` queries are answered
+    lazily while walking the tree, so a caller that stops early never
+    visits the rest of the document. Other expressions are evaluated in
+    full first.
+    
+    Args:
+        tree: The root element of the parsed document
+        xpath: XPath expression to find elements
+        file_type: Type of the file ('svg', 'html', or 'xml')
+        
+    Returns:
+        Iterator over the matching elements
+    """
+    matches = _iter_simple(tree, xpath, file_type)
+    if matches is not None:
+        return matches
+    return iter(find_elements_by_xpath(tree, xpath, file_type))
+
+
+def count_elements(tree: Any) -> int:
+    """Count the elements in a document, like ``len(tree.xpath('//*'))``.
+    
+    The tree is walked with ``iter('*')``, which skips comments and
+    processing instructions, without building a list of the elements.
+    
+    Args:
+        tree: The root element of the parsed document
+        
+    Returns:
+        Number of elements in the document, including the root
+    """
+    return sum(1 for _ in tree.iter('*'))
+
+
+def _element_path(tree: Any, element: Any, index: int) -> str:
+    """Return the path of an element, or a positional name if unavailable."""
+    try:
+        # Try to get the element path (lxml only)
+        return tree.getpath(element) if hasattr(tree, 'getpath') else f"element[{index}]"
+    except Exception:
+        return f"element[{index}]"
+
+
 def list_elements(tree: Any, xpath: str = "//*", file_type: str = 'xml') -> List[Dict]:
     """List elements matching the XPath with their properties.
     
@@ -182,22 +295,12 @@ def list_elements(tree: Any, xpath: str = "//*", file_type: str = 'xml') -> List
     Returns:
         List of dictionaries with element properties
     """
-    elements = find_elements_by_xpath(tree, xpath, file_type)
-    result = []
-
-    for i, element in enumerate(elements):
-        try:
-            # Try to get the element path (lxml only)
-            element_path = tree.getpath(element) if hasattr(tree, 'getpath') else f"element[{i}]"
-        except Exception:
-            element_path = f"element[{i}]"
-            
-        element_info = {
-            'path': element_path,
+    return [
+        {
+            'path': _element_path(tree, element, i),
             'tag': getattr(element, 'tag', str(type(element))),
             'text': (getattr(element, 'text', '') or "").strip(),
             'attributes': dict(getattr(element, 'attrib', {}))
         }
-        result.append(element_info)
-
-    return result
+        for i, element in enumerate(iter_by_xpath(tree, xpath, file_type))
+    ]
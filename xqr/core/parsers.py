@@ -4,6 +4,8 @@ Parsing utilities for the XQR package.
 This module provides functionality for parsing XML/HTML/SVG files and detecting file types.
 """
 
+import copy
+import threading
 import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import Tuple, Optional, Any, Union
@@ -14,6 +16,11 @@ try:
 except ImportError:
     LXML_AVAILABLE = False
 
+# Parsers are reused for every document instead of being set up per parse.
+# lxml parsers must not be used from several threads at once (e.g. with a
+# threading server_class for start_server), so each thread gets its own pair.
+_PARSERS = threading.local()
+
 try:
     from bs4 import BeautifulSoup
     BS4_AVAILABLE = True
@@ -21,18 +28,17 @@ except ImportError:
     BS4_AVAILABLE = False
 
 
-def detect_file_type(file_path: Union[str, Path], content: str) -> str:
+def detect_file_type(file_path: Optional[Union[str, Path]], content: str) -> str:
     """Detect the type of file based on its extension and content.
     
     Args:
-        file_path: Path to the file
+        file_path: Path to the file, or None for in-memory content
         content: File content as string
         
     Returns:
         str: File type ('svg', 'html', or 'xml')
     """
-    file_path = Path(file_path)
-    extension = file_path.suffix.lower()
+    extension = Path(file_path).suffix.lower() if file_path else ""
     content_lower = content.lower()
 
     if extension == '.svg' or '<svg' in content_lower:
@@ -44,6 +50,15 @@ def detect_file_type(file_path: Union[str, Path], content: str) -> str:
     return 'xml'  # Default to XML
 
 
+def _lxml_parser(file_type: str) -> Any:
+    """Return the calling thread's lxml parser for the file type."""
+    if not hasattr(_PARSERS, 'xml'):
+        # collect_ids keeps an id -> element index for fast lookups by id
+        _PARSERS.xml = etree.XMLParser(collect_ids=True)
+        _PARSERS.html = html.HTMLParser(collect_ids=True)
+    return _PARSERS.html if file_type == 'html' else _PARSERS.xml
+
+
 def parse_with_lxml(content: str, file_type: str) -> Tuple[Any, Any]:
     """Parse content using lxml library.
     
@@ -61,10 +76,11 @@ def parse_with_lxml(content: str, file_type: str) -> Tuple[Any, Any]:
         raise ImportError("lxml is required for this operation")
         
     try:
+        parser = _lxml_parser(file_type)
         if file_type == 'html':
-            tree = html.fromstring(content)
+            tree = html.fromstring(content, parser=parser)
         else:
-            tree = etree.fromstring(content.encode('utf-8'))
+            tree = etree.fromstring(content.encode('utf-8'), parser)
         return tree, tree
     except Exception as e:
         raise ValueError(f"Failed to parse with lxml: {e}")
@@ -89,6 +105,37 @@ def parse_with_elementtree(content: str) -> Tuple[Any, Any]:
         raise ValueError(f"Failed to parse with ElementTree: {e}")
 
 
+def parse_content(
+    content: str,
+    file_path: Optional[Union[str, Path]] = None
+) -> Tuple[Any, Any, str]:
+    """Parse document content that is already in memory.
+    
+    Args:
+        content: Document content as string
+        file_path: Path the content came from, used as a file type hint
+        
+    Returns:
+        Tuple of (tree, root, file_type)
+        
+    Raises:
+        ValueError: If the content cannot be parsed
+    """
+    file_type = detect_file_type(file_path, content)
+    
+    # Try lxml first if available
+    if LXML_AVAILABLE:
+        try:
+            tree, root = parse_with_lxml(content, file_type)
+            return tree, root, file_type
+        except Exception as e:
+            print(f"lxml parsing failed: {e}, trying ElementTree...")
+    
+    # Fall back to ElementTree
+    tree, root = parse_with_elementtree(content)
+    return tree, root, file_type
+
+
 def parse_file(file_path: Union[str, Path]) -> Tuple[Any, Any, str, str]:
     """Parse a file and return its contents as a parse tree.
     
@@ -103,25 +150,64 @@ def parse_file(file_path: Union[str, Path]) -> Tuple[Any, Any, str, str]:
         ValueError: If the file cannot be parsed
     """
     file_path = Path(file_path)
-    if not file_path.exists():
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            original_content = f.read()
+    except FileNotFoundError:
         raise FileNotFoundError(f"File not found: {file_path}")
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        original_content = f.read()
+    try:
+        tree, root, file_type = parse_content(original_content, file_path)
+        return tree, root, file_type, original_content
+    except Exception as e:
+        raise ValueError(f"Failed to parse file {file_path}: {e}")
+
+
+def parse_subtree(file_path: Union[str, Path], tag: str) -> Tuple[Any, Any, str]:
+    """Parse only the first element with the given tag from a file.
     
-    file_type = detect_file_type(file_path, original_content)
+    The file is streamed with ``iterparse`` and parsing stops at the end of
+    the first matching element, so the rest of a large document is never
+    built in memory. Tag names match in any namespace unless one is given
+    in ``{uri}tag`` form.
     
-    # Try lxml first if available
-    if LXML_AVAILABLE:
-        try:
-            tree, root = parse_with_lxml(original_content, file_type)
-            return tree, root, file_type, original_content
-        except Exception as e:
-            print(f"lxml parsing failed: {e}, trying ElementTree...")
+    Args:
+        file_path: Path to the file to parse
+        tag: Tag name of the subtree root
+        
+    Returns:
+        Tuple of (tree, root, file_type) for the detached subtree
+        
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file cannot be parsed or has no such element
+    """
+    if not LXML_AVAILABLE:
+        raise ImportError("lxml is required for subtree parsing")
+    
+    file_path = Path(file_path)
+    if not file_path.exists():
+        raise FileNotFoundError(f"File not found: {file_path}")
+    
+    # Only the extension is available without reading the whole file
+    file_type = detect_file_type(file_path, '')
+    match_tag = tag if tag.startswith('{') else '{*}' + tag
     
-    # Fall back to ElementTree
     try:
-        tree, root = parse_with_elementtree(original_content)
-        return tree, root, file_type, original_content
-    except Exception as e:
+        context = etree.iterparse(
+            str(file_path),
+            events=('end',),
+            tag=match_tag,
+            html=file_type == 'html'
+        )
+        for _, element in context:
+            # Copy the subtree out so the partially parsed document,
+            # including everything before the match, can be freed
+            subtree = copy.deepcopy(element)
+            break
+        else:
+            raise ValueError(f"No <{tag}> element found in {file_path}")
+    except etree.XMLSyntaxError as e:
         raise ValueError(f"Failed to parse file {file_path}: {e}")
+    
+    return subtree, subtree, file_type
@@ -5,8 +5,18 @@ This module provides functionality for working with XPath expressions,
 especially for handling SVG namespaces and other XPath-related operations.
 """
 
+from functools import lru_cache
 from typing import Dict, Tuple, List, Any
 
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+SVG_NAMESPACE = 'http://www.w3.org/2000/svg'
+SVG_NAMESPACES = {'svg': SVG_NAMESPACE}
+
 
 def prepare_xpath_for_svg(xpath: str) -> Tuple[str, Dict[str, str]]:
     """Prepare XPath expression and namespaces for SVG files.
@@ -17,8 +27,7 @@ def prepare_xpath_for_svg(xpath: str) -> Tuple[str, Dict[str, str]]:
     Returns:
         Tuple of (modified_xpath, namespaces_dict)
     """
-    # Define SVG namespace
-    namespaces = {'svg': 'http://www.w3.org/2000/svg'}
+    namespaces = SVG_NAMESPACES
     
     # If the xpath already uses local-name(), use it as-is
     if 'local-name()' in xpath:
@@ -39,6 +48,8 @@ def prepare_xpath_for_svg(xpath: str) -> Tuple[str, Dict[str, str]]:
     
     # Handle simple element names (e.g., 'svg')
     if not any(c in xpath for c in '[]/()@'):
+        if xpath == '*':
+            return '//*', namespaces
         return f'//*[local-name()="{xpath}"]', namespaces
     
     # For more complex XPath expressions, we'll build it part by part
@@ -69,8 +80,8 @@ def prepare_xpath_for_svg(xpath: str) -> Tuple[str, Dict[str, str]]:
             elem_part, pred = part.split('[', 1)
             pred = '[' + pred
             
-            # Handle element name if it exists
-            if elem_part:
+            # Handle element name if it exists (a wildcard needs no rewrite)
+            if elem_part and elem_part != '*':
                 elem_part = f'*[local-name()="{elem_part}"]'
             
             # Special handling for simple attribute predicates
@@ -82,9 +93,12 @@ def prepare_xpath_for_svg(xpath: str) -> Tuple[str, Dict[str, str]]:
                         attr_name, attr_value = attr_part.split('=', 1)
                         # Clean up quotes if present
                         attr_name = attr_name.strip()
-                        attr_value = attr_value.strip().strip("\"'")
+                        attr_value = attr_value.strip()
+                        # XPath variables ($name) are bound at evaluation
+                        if not attr_value.startswith('$'):
+                            attr_value = "'" + attr_value.strip("\"'") + "'"
                         # Rebuild the predicate with proper namespace handling
-                        pred = f"[@*[local-name()='{attr_name}']='{attr_value}']"
+                        pred = f"[@*[local-name()='{attr_name}']={attr_value}]"
                 except (IndexError, ValueError):
                     # If parsing fails, fall back to the original predicate
                     pass
@@ -93,6 +107,9 @@ def prepare_xpath_for_svg(xpath: str) -> Tuple[str, Dict[str, str]]:
             continue
         
         # Handle simple element names
+        if part == '*':
+            parts.append(part)
+            continue
         parts.append(f'*[local-name()="{part}"]')
     
     # Join parts and ensure it starts with // if not already a path
@@ -103,19 +120,14 @@ def prepare_xpath_for_svg(xpath: str) -> Tuple[str, Dict[str, str]]:
     return result, namespaces
 
 
-def find_elements_by_xpath(tree: Any, xpath: str, file_type: str = 'xml') -> List[Any]:
-    """Find elements using XPath with namespace support.
+def validate_xpath(xpath: str) -> None:
+    """Check an XPath expression for common syntax errors.
     
     Args:
-        tree: The root element of the parsed document
-        xpath: XPath expression to find elements
-        file_type: Type of the file ('svg', 'html', or 'xml')
-        
-    Returns:
-        List of matching elements
+        xpath: XPath expression to check
         
     Raises:
-        ValueError: If the XPath expression is invalid or empty
+        ValueError: If the XPath expression is empty or malformed
     """
     if not xpath or not xpath.strip():
         raise ValueError("XPath expression cannot be empty")
@@ -155,24 +167,67 @@ def find_elements_by_xpath(tree: Any, xpath: str, file_type: str = 'xml') -> Lis
         raise ValueError("Invalid XPath expression: '//.' is not a valid XPath step")
     if ']]' in xpath and ']]>' not in xpath:  # Allow ]]> as it's valid in XPath 2.0+
         raise ValueError("Invalid XPath expression: ']]' is not valid outside of CDATA")
+
+
+@lru_cache(maxsize=512)
+def compile_xpath(xpath: str, file_type: str = 'xml') -> Any:
+    """Validate, rewrite and compile an XPath expression.
+    
+    Results are cached, so each distinct expression is parsed once per
+    process no matter how many documents or calls it is used for.
+    
+    Args:
+        xpath: XPath expression to compile
+        file_type: Type of the file ('svg', 'html', or 'xml')
+        
+    Returns:
+        Compiled ``lxml.etree.XPath`` object
+        
+    Raises:
+        ValueError: If the XPath expression is invalid
+        ImportError: If lxml is not available
+    """
+    if not LXML_AVAILABLE:
+        raise ImportError("lxml is required for XPath support")
+    
+    validate_xpath(xpath)
+    
+    # Handle SVG namespace
+    if file_type == 'svg':
+        expression, namespaces = prepare_xpath_for_svg(xpath)
+    else:
+        expression, namespaces = xpath, None
     
     try:
-        # Handle SVG namespace
-        if file_type == 'svg':
-            xpath, namespaces = prepare_xpath_for_svg(xpath)
-        else:
-            namespaces = {}
-            
-        # Test the XPath expression with a simple evaluation first
-        # This helps catch syntax errors that our validation might miss
-        test_result = tree.xpath('count(//*)')  # Simple XPath that should work on any XML/HTML
-        if test_result is None:
-            raise ValueError("Failed to evaluate simple XPath expression")
-            
-        # Now try the actual XPath
-        result = tree.xpath(xpath, namespaces=namespaces)
-        return result
+        # Plain strings for text/attribute results: lxml otherwise wraps each
+        # one in a "smart string" holding a reference back to its parent
+        return etree.XPath(expression, namespaces=namespaces, smart_strings=False)
+    except etree.XPathError as e:
+        raise ValueError(f"Invalid XPath expression: {xpath}") from e
+
+
+def find_elements_by_xpath(tree: Any, xpath: str, file_type: str = 'xml', **variables: Any) -> List[Any]:
+    """Find elements using XPath with namespace support.
+    
+    Values referenced as ``$name`` in the expression are passed as keyword
+    arguments, so one compiled expression serves every value.
+    
+    Args:
+        tree: The root element of the parsed document
+        xpath: XPath expression to find elements
+        file_type: Type of the file ('svg', 'html', or 'xml')
+        **variables: Values for the XPath variables used in the expression
+        
+    Returns:
+        List of matching elements
         
+    Raises:
+        ValueError: If the XPath expression is invalid or empty
+    """
+    compiled = compile_xpath(xpath, file_type)
+    
+    try:
+        return compiled(tree, **variables)
     except Exception as e:
         # Try to provide a more specific error message for common issues
         error_msg = str(e).lower()
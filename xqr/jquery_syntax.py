@@ -1,13 +1,75 @@
 """jQuery-like syntax support for XQR."""
 
+import re
+from functools import lru_cache
 from typing import Any, List, Optional, Union, cast
 
-from lxml import etree
 import cssselect
 
+# Simple selectors: a tag name and/or a single id or class, e.g. "rect",
+# "#main", ".item", "li.item" or "g#layer1"
+_SIMPLE_SELECTOR = re.compile(r'^([A-Za-z_][\w-]*|\*)?(?:#([\w-]+)|\.([\w-]+))?$')
+
+# $(selector) optionally followed by a single .method(args) call
+_CMD_RE = re.compile(
+    r"""^\$\(\s*(['"]?)(.+?)\1\s*\)(?:\.(\w+)\((.*)\))?\s*$""",
+    re.DOTALL
+)
+
+# One method argument: a quoted string or a bare literal, up to the next comma
+_ARG_RE = re.compile(r"""\s*(?:'([^']*)'|"([^"]*)"|([^,]+?))\s*(?:,|$)""")
+
+_TRANSLATOR = cssselect.GenericTranslator()
+
+
+@lru_cache(maxsize=256)
+def selector_to_xpath(selector: str) -> str:
+    """Translate a CSS selector to an XPath expression.
+    
+    Args:
+        selector: CSS selector string
+        
+    Returns:
+        Equivalent XPath expression
+        
+    Raises:
+        ValueError: If the selector is invalid
+    """
+    # Simple selectors cover nearly all real use; build their XPath
+    # directly instead of tokenizing and parsing them with cssselect
+    match = _SIMPLE_SELECTOR.match(selector.strip())
+    if match and any(match.groups()):
+        tag, id_value, class_name = match.groups()
+        xpath = f"//{tag or '*'}"
+        if id_value:
+            xpath += f"[@id='{id_value}']"
+        elif class_name:
+            xpath += f"[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+        return xpath
+    
+    try:
+        return _TRANSLATOR.css_to_xpath(selector, prefix='//')
+    except cssselect.SelectorError as e:
+        raise ValueError(f"Invalid CSS selector: {selector}") from e
+
+
+def _parse_arg(arg: str) -> Union[str, bool, int, float]:
+    """Convert a bare (unquoted) method argument to a Python value."""
+    if arg.lower() == 'true':
+        return True
+    if arg.lower() == 'false':
+        return False
+    if arg.isdigit():
+        return int(arg)
+    if arg.replace('.', '', 1).isdigit():
+        return float(arg)
+    return arg
+
 class JQuerySyntax:
     """Wrapper class to provide jQuery-like syntax for element operations."""
 
+    __slots__ = ('editor', 'selector', 'xpath', '_id')
+
     def __init__(self, editor: Any, selector: str) -> None:
         """Initialize with a FileEditor instance and a CSS selector.
 
@@ -17,25 +79,15 @@ class JQuerySyntax:
         """
         self.editor = editor
         self.selector = selector
-        self.xpath_expr: List[Any] = []
-        self.xpath: str = ""
-        self._compile_selector(selector)
-
-    def _compile_selector(self, selector: str) -> None:
-        """Compile CSS selector to XPath.
-
-        Args:
-            selector: CSS selector string
-        """
-        try:
-            self.xpath_expr = cssselect.CSSSelector(selector, translator='xhtml').path
-            # Convert the compiled XPath to string
-            self.xpath = ''.join(
-                etree.tostring(step, encoding='unicode')
-                for step in self.xpath_expr
-            )
-        except cssselect.SelectorError as e:
-            raise ValueError(f"Invalid CSS selector: {selector}") from e
+        self.xpath: str = selector_to_xpath(selector)
+        
+        # A bare "#id" selector is served from the editor's id index
+        # instead of scanning the document with //*[@id='...']
+        self._id: Optional[str] = None
+        match = _SIMPLE_SELECTOR.match(selector.strip())
+        if match and match.group(1) in (None, '*') and match.group(2):
+            if hasattr(editor, 'get_by_id'):
+                self._id = match.group(2)
     
     def css(
         self,
@@ -54,6 +106,9 @@ class JQuerySyntax:
         """
         if value is None:
             # Get CSS property
+            if self._id is not None:
+                element = self.editor.get_by_id(self._id)
+                return element.get('style', "") if element is not None else ""
             result = self.editor.get_element_attribute(self.xpath, 'style')
             return cast(str, result)  # We know this will be a string for CSS
         # Set CSS property
@@ -75,6 +130,14 @@ class JQuerySyntax:
             If value is None, returns current attribute value.
             Otherwise, returns self for method chaining.
         """
+        if self._id is not None:
+            element = self.editor.get_by_id(self._id)
+            if value is None:
+                return element.get(name, "") if element is not None else ""
+            if element is not None:
+                element.set(name, str(value))
+                self.editor.modified = True
+            return self
         if value is None:
             result = self.editor.get_element_attribute(self.xpath, name)
             return cast(str, result)  # We know this will be a string for attributes
@@ -94,6 +157,14 @@ class JQuerySyntax:
             If text is None, returns current text content.
             Otherwise, returns self for method chaining.
         """
+        if self._id is not None:
+            element = self.editor.get_by_id(self._id)
+            if text is None:
+                return (element.text or "") if element is not None else ""
+            if element is not None:
+                element.text = text
+                self.editor.modified = True
+            return self
         if text is None:
             result = self.editor.get_element_text(self.xpath)
             return cast(str, result)  # We know this will be a string for text
@@ -119,6 +190,14 @@ class JQuerySyntax:
         self.editor.set_element_html(self.xpath, html)
         return self
 
+# Methods callable from process_jquery_syntax
+_DISPATCH = {
+    'css': JQuerySyntax.css,
+    'attr': JQuerySyntax.attr,
+    'text': JQuerySyntax.text,
+    'html': JQuerySyntax.html,
+}
+
 def process_jquery_syntax(command: str, editor: Any) -> str:
     """Process a jQuery-like command and execute it.
 
@@ -130,90 +209,38 @@ def process_jquery_syntax(command: str, editor: Any) -> str:
         Result of the operation as a string
     """
     try:
-        # Simple parser for the jQuery-like syntax
-        if not command.startswith('$(') or not (command.endswith(')') or ').' in command):
+        match = _CMD_RE.match(command.strip())
+        if not match:
             raise ValueError(
                 "Invalid jQuery syntax. Expected format: $(selector).method(...)"
             )
-
-        # Extract selector
-        selector_end = command.find(')')
-        if selector_end == -1:
-            raise ValueError("Missing closing parenthesis in selector")
-
-        selector = command[2:selector_end].strip('"\'')
+        selector, method_name, args_str = match.group(2, 3, 4)
 
         # Create jQuery-like wrapper
         jq = JQuerySyntax(editor, selector)
 
-        # Parse method calls
-        method_calls = command[selector_end+1:].strip()
-
-        # Simple evaluation of method calls
-        if method_calls.startswith('.'):
-            method_calls = method_calls[1:]
-
-            # Simple method call parser (supports basic cases)
-            if '(' in method_calls and method_calls.endswith(')'):
-                method_name = method_calls.split('(')[0]
-                args_str = method_calls[method_calls.find('(')+1:-1]
-
-                # Simple argument parsing (supports basic literals)
-                args = []
-                current_arg = ''
-                in_quotes = False
-                quote_char = None
-
-                for char in args_str:
-                    if char in ("'", '"') and (not in_quotes or char == quote_char):
-                        in_quotes = not in_quotes
-                        if in_quotes:
-                            quote_char = char
-                        else:
-                            args.append(current_arg)
-                            current_arg = ''
-                    elif char == ',' and not in_quotes:
-                        if current_arg.strip():
-                            args.append(current_arg.strip())
-                        current_arg = ''
-                    else:
-                        current_arg += char
-
-                if current_arg.strip():
-                    args.append(current_arg.strip())
-
-                # Clean up arguments (remove quotes, convert types)
-                processed_args: List[Union[str, bool, int, float]] = []
-                for arg in args:
-                    arg = arg.strip()
-                    if (arg.startswith("'") and arg.endswith("'")) or \
-                       (arg.startswith('"') and arg.endswith('"')):
-                        processed_args.append(arg[1:-1])
-                    elif arg.lower() == 'true':
-                        processed_args.append(True)
-                    elif arg.lower() == 'false':
-                        processed_args.append(False)
-                    elif arg.isdigit():
-                        processed_args.append(int(arg))
-                    elif arg.replace('.', '', 1).isdigit():
-                        processed_args.append(float(arg))
-                    else:
-                        processed_args.append(arg)
-
-                # Call the method
-                method = getattr(jq, method_name, None)
-                if not callable(method):
-                    raise ValueError(f"Unknown method: {method_name}")
-
-                result = method(*processed_args)
-
-                # If the method returns self, indicate success
-                if result is jq:
-                    return (
-                        f"✅ Applied {method_name} to "
-                        f"{len(editor.find_elements(jq.xpath))} elements"
-                    )
-                return str(result)
+        if method_name:
+            processed_args: List[Union[str, bool, int, float]] = []
+            for single, double, bare in _ARG_RE.findall(args_str):
+                if bare:
+                    processed_args.append(_parse_arg(bare))
+                else:
+                    processed_args.append(single or double)
+
+            # Call the method
+            method = _DISPATCH.get(method_name)
+            if method is None:
+                raise ValueError(f"Unknown method: {method_name}")
+
+            result = method(jq, *processed_args)
+
+            # If the method returns self, indicate success
+            if result is jq:
+                return (
+                    f"✅ Applied {method_name} to "
+                    f"{len(editor.find_elements(jq.xpath))} elements"
+                )
+            return str(result)
 
         return f"✅ Selected {len(editor.find_elements(jq.xpath))} elements"
 
@@ -79,7 +79,7 @@ class FileEditorServer(BaseHTTPRequestHandler):
                 'success': True,
                 'message': f'File loaded: {file_path}',
                 'file_type': editor.file_type,
-                'elements_count': len(editor.find_by_xpath("//*"))
+                'elements_count': editor.count_elements()
             }
         except Exception as e:
             response = {'success': False, 'error': str(e)}
@@ -173,7 +173,7 @@ class FileEditorServer(BaseHTTPRequestHandler):
             {
                 'path': path,
                 'file_type': editor.file_type,
-                'elements_count': len(editor.find_by_xpath("//*"))
+                'elements_count': editor.count_elements()
             }
             for path, editor in self.editors.items()
         ]
@@ -198,7 +198,7 @@ class FileEditorServer(BaseHTTPRequestHandler):
                 'success': True,
                 'file_path': file_path,
                 'file_type': editor.file_type,
-                'elements_count': len(editor.find_by_xpath("//*"))
+                'elements_count': editor.count_elements()
             }
         except Exception as e:
             response = {'success': False, 'error': str(e)}
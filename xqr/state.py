@@ -32,13 +32,13 @@ def load_state() -> Dict[str, Any]:
     Returns:
         Dictionary containing the saved state, or empty dict if no state exists
     """
+    # A missing state file is an OSError like any other read error
     try:
-        if STATE_FILE.exists():
-            with open(STATE_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if not isinstance(data, dict):
-                    return {}
-                return data
+        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+            if not isinstance(data, dict):
+                return {}
+            return data
     except (json.JSONDecodeError, OSError):
         # If there's any error reading the state file, return empty state
         pass
@@ -87,14 +87,27 @@ def get_current_file() -> Optional[str]:
     return str(result) if result is not None else None
 
 
-def set_current_file(file_path: Optional[str]) -> None:
+def get_current_subtree() -> Optional[str]:
+    """Get the subtree tag the current file was loaded with.
+
+    Returns:
+        Tag name of the loaded subtree, or None if the whole file is loaded
+    """
+    return get_state('current_subtree')
+
+
+def set_current_file(file_path: Optional[str], subtree: Optional[str] = None) -> None:
     """Set the current file path in state.
 
     Args:
         file_path: Path to the current file, or None to clear
+        subtree: Tag name if only a subtree of the file is loaded
     """
+    state = load_state()
     if file_path is None:
-        set_state('current_file', None)
+        state['current_file'] = None
     else:
         # Store as absolute path for consistency
-        set_state('current_file', str(Path(file_path).absolute()))
+        state['current_file'] = str(Path(file_path).absolute())
+    state['current_subtree'] = subtree if file_path is not None else None
+    save_state(state)